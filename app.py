@@ -6,22 +6,60 @@ Provides a web interface and REST API for password strength evaluation.
 """
 
 from flask import Flask, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from evaluator import PasswordEvaluator
 from cli import load_dictionary_words
-from config import WORDLIST_FILE, BLACKLIST_FILE
+from config import WORDLIST_FILE, BLACKLIST_FILE, MAX_BATCH_SIZE
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider serializing responses with orjson's C encoder (used when
+    installed). Requests are still parsed by Flask's default parser, which
+    accepts everything the standard library does (e.g. lone surrogate escapes).
+    """
+    
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Options such as indent only the default encoder understands
+            return super().dumps(obj, **kwargs)
+        try:
+            # Keep Flask's default of sorted keys
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # orjson rejects strings the default encoder can escape, such as
+            # lone surrogates echoed back from the request
+            return super().dumps(obj)
+
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for API access
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+# Debug mode (auto-reloader + debugger) is opt-in via FLASK_DEBUG=1
+DEBUG = os.environ.get('FLASK_DEBUG') == '1'
 
 # Initialize evaluator
-dictionary_words = load_dictionary_words(WORDLIST_FILE)
-evaluator = PasswordEvaluator(
-    dictionary_words=dictionary_words,
-    blacklist_file=BLACKLIST_FILE
-)
+# With the reloader, this script runs twice: in a watcher process that only
+# restarts the server, and in the child that serves requests. Only the child
+# needs the wordlists, so skip loading them in the watcher.
+if __name__ == '__main__' and DEBUG and os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+    evaluator = None
+else:
+    dictionary_words = load_dictionary_words(WORDLIST_FILE)
+    evaluator = PasswordEvaluator(
+        dictionary_words=dictionary_words,
+        blacklist_file=BLACKLIST_FILE
+    )
 
 
 @app.route('/')
@@ -70,6 +108,53 @@ def evaluate_password():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/evaluate_batch', methods=['POST'])
+def evaluate_password_batch():
+    """
+    API endpoint for evaluating several passwords at once.
+    
+    Accepts JSON:
+    {
+        "passwords": ["string", ...],
+        "username": "string (optional)",
+        "email": "string (optional)"
+    }
+    
+    Returns JSON {"results": [...]} with one evaluation result per password,
+    in request order.
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({"error": "No JSON data provided"}), 400
+        
+        passwords = data.get('passwords')
+        username = data.get('username')
+        email = data.get('email')
+        
+        if not isinstance(passwords, list) or not passwords:
+            return jsonify({"error": "A non-empty list of passwords is required"}), 400
+        
+        if len(passwords) > MAX_BATCH_SIZE:
+            return jsonify({"error": f"At most {MAX_BATCH_SIZE} passwords per request"}), 400
+        
+        if not all(isinstance(password, str) and password for password in passwords):
+            return jsonify({"error": "Passwords must be non-empty strings"}), 400
+        
+        # Evaluate passwords
+        results = evaluator.evaluate_batch(
+            passwords,
+            username=username,
+            email=email
+        )
+        
+        return jsonify({"results": results}), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
@@ -89,5 +174,6 @@ if __name__ == '__main__':
     print("Press Ctrl+C to stop the server")
     print("=" * 60)
     
-    app.run(debug=True, host='0.0.0.0', port=5001)
+    # Threaded so requests waiting on the HIBP API don't block each other
+    app.run(debug=DEBUG, host='0.0.0.0', port=5001, threaded=True)
 
@@ -10,10 +10,53 @@ stuffing attacks. Breach detection is critical for production security.
 """
 
 import hashlib
+import itertools
 import os
-from typing import Optional, Set, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
+from bloom import BloomFilter
 from config import BREACH_CONFIG, DATA_DIR
+from mph import PerfectHashTable
+from wordlist import load_wordlist
+
+LOCAL_BREACH_REASON = "Password found in common breach database (top 10k)"
+
+# Shared HTTP session for HIBP queries (created on first use, since the
+# 'requests' library is optional). Reusing it keeps connections alive so
+# repeated queries skip the TCP + TLS handshake.
+_SESSION = None
+
+
+def _sha1_hex(password: str) -> str:
+    """
+    Compute the uppercase SHA-1 hex digest of a password for HIBP lookups.
+    
+    SHA-1 is only used as the HIBP lookup key here, not for security, so
+    ``usedforsecurity=False`` lets hashlib pick its fastest backend. Repeated
+    submissions are served by BreachChecker's digest-keyed HIBP cache.
+    """
+    return hashlib.sha1(password.encode('utf-8'), usedforsecurity=False).hexdigest().upper()
+
+
+def _get_session():
+    """
+    Return the shared keep-alive HTTP session for HIBP queries.
+    
+    Raises:
+        ImportError: If the 'requests' library is not installed
+    """
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        # Pool sized for concurrent web workers hitting the same host
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=16))
+        _SESSION = session
+    return _SESSION
 
 
 class BreachChecker:
@@ -27,57 +70,263 @@ class BreachChecker:
             blacklist_file: Path to local blacklist file. If None, uses default from config.
         """
         self.blacklist_file = blacklist_file or BREACH_CONFIG["local_blacklist_file"]
-        self.blacklist: Set[str] = set()
-        self._load_blacklist()
+        self.blacklist: FrozenSet[bytes] = frozenset()
+        # Memory-mapped perfect hash table, used instead of the set when a
+        # prebuilt .mph file (see build_mph.py) is available
+        self.static_blacklist: Optional[PerfectHashTable] = None
+        self._mph_path: Optional[str] = None
+        self._bloom: Optional[BloomFilter] = None
+        # Serializes runtime additions; lookups never take it because the
+        # blacklist set is replaced, not mutated
+        self._blacklist_lock = threading.Lock()
+        self._load_blacklist_cached()
+        self._build_bloom()
+        
+        # LRU cache of HIBP results, keyed by a keyed BLAKE2b digest of the
+        # password. Values are only the breached flag and a breach count, so
+        # the cache itself holds nothing derived from the plaintext but the
+        # digests. The key is random per process, so cached digests can't be
+        # brute-forced offline.
+        self._hibp_cache: "OrderedDict[bytes, Tuple[bool, Optional[str]]]" = OrderedDict()
+        self._hibp_cache_key = os.urandom(16)
+        self._hibp_cache_lock = threading.Lock()
     
-    def _load_blacklist(self):
-        """Load local blacklist from file."""
+    def _load_blacklist_cached(self):
+        """
+        Load local blacklist from file, via its on-disk pickle cache.
+        
+        The parsed blacklist is pickled next to the text file on first load, so
+        later process starts skip re-parsing it line by line. Entries are kept
+        as UTF-8 bytes, which are compact and cheap to hash.
+        
+        If an up-to-date perfect hash table (.mph) sits next to the text file,
+        it is memory-mapped instead and no set is built at all.
+        """
         blacklist_path = os.path.join(DATA_DIR, os.path.basename(self.blacklist_file))
         
-        # Try to load blacklist, but don't fail if file doesn't exist
-        if os.path.exists(blacklist_path):
+        mph_path = os.path.splitext(blacklist_path)[0] + ".mph"
+        if os.path.exists(mph_path) and (
+            not os.path.exists(blacklist_path)
+            or os.path.getmtime(mph_path) >= os.path.getmtime(blacklist_path)
+        ):
             try:
-                with open(blacklist_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    # Read all lines, strip whitespace, convert to lowercase
-                    self.blacklist = {
-                        line.strip().lower() 
-                        for line in f 
-                        if line.strip()
-                    }
-            except Exception as e:
-                # Log error but continue without blacklist
-                print(f"Warning: Could not load blacklist: {e}")
-                self.blacklist = set()
-        else:
-            # File doesn't exist - will be created by setup script
-            self.blacklist = set()
+                self.static_blacklist = PerfectHashTable(mph_path)
+                self._mph_path = mph_path
+                return
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not load perfect hash blacklist: {e}")
+        
+        # Try to load blacklist, but don't fail if file doesn't exist
+        # (a missing file yields an empty set - it will be created by setup script)
+        try:
+            self.blacklist = load_wordlist(blacklist_path, as_bytes=True)
+        except Exception as e:
+            # Log error but continue without blacklist
+            print(f"Warning: Could not load blacklist: {e}")
+            self.blacklist = frozenset()
     
-    def check_breach(self, password: str) -> Tuple[bool, Optional[str]]:
+    def _build_bloom(self):
+        """
+        Build a Bloom filter front-end for large blacklists.
+        
+        Small blacklists skip the filter: a single set lookup is already
+        cheaper than computing the filter's hashes.
+        
+        With a perfect hash table the blacklist itself stays on disk, and only
+        the filter is held in memory; hits are confirmed against the table.
+        The filter is then loaded from the .bloom file written next to the
+        table by build_mph.py, rather than rebuilt by hashing every entry.
+        """
+        num_entries = len(self.blacklist)
+        if self.static_blacklist is not None:
+            num_entries += len(self.static_blacklist)
+        if num_entries < BREACH_CONFIG["bloom_min_entries"]:
+            self._bloom = None
+            return
+        
+        if self._mph_path is not None:
+            bloom_path = os.path.splitext(self._mph_path)[0] + ".bloom"
+            if (os.path.exists(bloom_path)
+                    and os.path.getmtime(bloom_path) >= os.path.getmtime(self._mph_path)):
+                try:
+                    self._bloom = BloomFilter.load(bloom_path)
+                    return
+                except (OSError, ValueError) as e:
+                    print(f"Warning: Could not load blacklist Bloom filter: {e}")
+        
+        entries = itertools.chain(self.blacklist, self.static_blacklist or ())
+        self._bloom = BloomFilter.from_items(
+            entries, num_entries, BREACH_CONFIG["bloom_error_rate"]
+        )
+    
+    def _in_blacklist(self, password_key: bytes) -> bool:
+        """Check an encoded, lowercased password against the local blacklist."""
+        # The Bloom filter, if any, rejects most non-breached passwords first
+        if self._bloom is not None and password_key not in self._bloom:
+            return False
+        if password_key in self.blacklist:
+            return True
+        return self.static_blacklist is not None and password_key in self.static_blacklist
+    
+    def check_breach(self, password: str,
+                     password_lower: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """
         Check if password appears in breach databases.
         
         Args:
             password: Password to check
+            password_lower: password.lower(), if the caller already has it
         
         Returns:
             Tuple of (is_breached, reason)
             is_breached: True if password is found in breaches
             reason: Human-readable reason for breach status
         """
-        password_lower = password.lower()
-        
         # Check local blacklist first (fastest)
-        if password_lower in self.blacklist:
-            return True, "Password found in common breach database (top 10k)"
+        if password_lower is not None:
+            password_key = password_lower.encode('utf-8', errors='surrogatepass')
+        else:
+            password_key = self._blacklist_key(password)
+        if self._in_blacklist(password_key):
+            return True, LOCAL_BREACH_REASON
         
         # Check HIBP API if enabled
         if BREACH_CONFIG["hibp_enabled"]:
-            hibp_breached, hibp_reason = self._check_hibp(password)
+            hibp_breached, hibp_reason = self._check_hibp_cached(password)
             if hibp_breached:
                 return True, hibp_reason
         
         return False, None
     
+    def check_breach_batch(self, passwords: List[str]) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Check many passwords against breach databases.
+        
+        Equivalent to calling check_breach for each password, but HIBP lookups
+        are grouped by hash prefix: one range query answers every password
+        whose SHA-1 shares that 5-character prefix. Results are read from and
+        stored in the same HIBP cache as check_breach uses.
+        
+        Args:
+            passwords: Passwords to check
+        
+        Returns:
+            List of (is_breached, reason) tuples, in input order
+        """
+        results: List[Tuple[bool, Optional[str]]] = []
+        # result index -> HIBP (is_breached, reason), as _check_hibp returns
+        hibp_results: Dict[int, Tuple[bool, Optional[str]]] = {}
+        # hash prefix -> [(result index, hash suffix), ...]
+        pending: Dict[str, List[Tuple[int, str]]] = {}
+        digests: Dict[int, bytes] = {}
+        
+        for index, password in enumerate(passwords):
+            if self._in_blacklist(self._blacklist_key(password)):
+                results.append((True, LOCAL_BREACH_REASON))
+                continue
+            results.append((False, None))
+            if not BREACH_CONFIG["hibp_enabled"]:
+                continue
+            
+            digest = self._hibp_digest(password)
+            cached = self._hibp_cache_get(digest)
+            if cached is not None:
+                hibp_results[index] = cached
+                continue
+            try:
+                password_hash = _sha1_hex(password)
+            except Exception as e:
+                hibp_results[index] = (False, self._hibp_error_reason(e))
+                continue
+            digests[index] = digest
+            pending.setdefault(password_hash[:5], []).append((index, password_hash[5:]))
+        
+        for hash_prefix, entries in pending.items():
+            try:
+                data = self._fetch_hibp_range(hash_prefix)
+            except Exception as e:
+                # Fail open, as in _check_hibp
+                failure = (False, self._hibp_error_reason(e))
+                for index, _ in entries:
+                    hibp_results[index] = failure
+                continue
+            for index, hash_suffix in entries:
+                result = self._hibp_result(self._find_hibp_count(data, hash_suffix))
+                hibp_results[index] = result
+                self._hibp_cache_put(digests[index], result)
+        
+        # Combined with the local result exactly as in check_breach
+        for index, (hibp_breached, hibp_reason) in hibp_results.items():
+            if hibp_breached:
+                results[index] = (True, hibp_reason)
+        
+        return results
+    
+    @staticmethod
+    def _blacklist_key(password: str) -> bytes:
+        """Return the encoded, lowercased form of a password used for blacklist lookups."""
+        # islower() is a single scan that exits early, and saves allocating a
+        # lowercased copy in the common all-lowercase case
+        password_lower = password if password.islower() else password.lower()
+        # surrogatepass: lone surrogates (e.g. from JSON input) can't be
+        # encoded strictly, but must still get a key
+        return password_lower.encode('utf-8', errors='surrogatepass')
+    
+    def _hibp_digest(self, password: str) -> bytes:
+        """Return the keyed digest under which a password's HIBP result is cached."""
+        # surrogatepass so a password _check_hibp can't handle still gets a
+        # digest, and reaches its error handling
+        return hashlib.blake2b(
+            password.encode('utf-8', errors='surrogatepass'), digest_size=16, key=self._hibp_cache_key
+        ).digest()
+    
+    def _hibp_cache_get(self, digest: bytes) -> Optional[Tuple[bool, Optional[str]]]:
+        """Return a cached HIBP result, or None if there is none."""
+        with self._hibp_cache_lock:
+            cached = self._hibp_cache.get(digest)
+            if cached is not None:
+                self._hibp_cache.move_to_end(digest)
+            return cached
+    
+    def _hibp_cache_put(self, digest: bytes, result: Tuple[bool, Optional[str]]):
+        """Cache an HIBP result, unless it records a failed lookup."""
+        cache_size = BREACH_CONFIG["hibp_cache_size"]
+        # Only a breach or a clean answer is definitive; (False, reason) means
+        # the lookup itself failed
+        is_breached, reason = result
+        if cache_size <= 0 or not (is_breached or reason is None):
+            return
+        with self._hibp_cache_lock:
+            self._hibp_cache[digest] = result
+            while len(self._hibp_cache) > cache_size:
+                self._hibp_cache.popitem(last=False)
+    
+    def _check_hibp_cached(self, password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check password against HIBP, reusing recent results.
+        
+        Passwords are often submitted repeatedly (e.g. web form retries), so
+        recent answers are cached to skip the network round-trip. Failed
+        lookups are not cached, so they are retried on the next call.
+        
+        Args:
+            password: Password to check
+        
+        Returns:
+            Tuple of (is_breached, reason)
+        """
+        if BREACH_CONFIG["hibp_cache_size"] <= 0:
+            return self._check_hibp(password)
+        
+        digest = self._hibp_digest(password)
+        cached = self._hibp_cache_get(digest)
+        if cached is not None:
+            return cached
+        
+        result = self._check_hibp(password)
+        self._hibp_cache_put(digest, result)
+        return result
+    
     def _check_hibp(self, password: str) -> Tuple[bool, Optional[str]]:
         """
         Check password against Have I Been Pwned API using k-anonymity.
@@ -92,33 +341,80 @@ class BreachChecker:
             Tuple of (is_breached, reason)
         """
         try:
-            import requests
-            
             # Compute SHA-1 hash
-            password_hash = hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+            password_hash = _sha1_hex(password)
             hash_prefix = password_hash[:5]
             hash_suffix = password_hash[5:]
             
             # Query HIBP API with prefix only (k-anonymity)
-            api_url = f"{BREACH_CONFIG['hibp_api_url']}{hash_prefix}"
-            response = requests.get(api_url, timeout=5)
-            
-            if response.status_code == 200:
-                # Check if our hash suffix appears in the response
-                # Response format: SUFFIX:COUNT (one per line)
-                for line in response.text.splitlines():
-                    if ':' in line:
-                        suffix, count = line.split(':', 1)
-                        if suffix == hash_suffix:
-                            return True, f"Password found in HIBP database ({count} breaches)"
+            data = self._fetch_hibp_range(hash_prefix)
             
-            return False, None
+            # Check if our hash suffix appears in the response
+            return self._hibp_result(self._find_hibp_count(data, hash_suffix))
             
-        except ImportError:
-            return False, "HIBP check requires 'requests' library"
         except Exception as e:
             # Network errors, API errors, etc. - fail open (don't block password)
-            return False, f"HIBP check failed: {str(e)}"
+            return False, self._hibp_error_reason(e)
+    
+    @staticmethod
+    def _hibp_result(count: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """Turn a breach count from an HIBP response (None if absent) into a result."""
+        if count is not None:
+            return True, f"Password found in HIBP database ({count} breaches)"
+        return False, None
+    
+    @staticmethod
+    def _hibp_error_reason(error: Exception) -> str:
+        """Return the reason reported for an HIBP lookup that failed with error."""
+        if isinstance(error, ImportError):
+            return "HIBP check requires 'requests' library"
+        return f"HIBP check failed: {str(error)}"
+    
+    @staticmethod
+    def _fetch_hibp_range(hash_prefix: str) -> bytes:
+        """
+        Fetch the HIBP range response for a 5-character SHA-1 prefix.
+        
+        Args:
+            hash_prefix: First 5 hex characters of the SHA-1 hash
+        
+        Returns:
+            Raw response body
+        
+        Raises:
+            ImportError: If the 'requests' library is not installed
+            RuntimeError: If the API returns a non-200 status
+        """
+        session = _get_session()
+        api_url = f"{BREACH_CONFIG['hibp_api_url']}{hash_prefix}"
+        response = session.get(api_url, timeout=5)
+        if response.status_code != 200:
+            raise RuntimeError(f"HIBP API returned status {response.status_code}")
+        return response.content
+    
+    @staticmethod
+    def _find_hibp_count(data: bytes, hash_suffix: str) -> Optional[str]:
+        """
+        Find a hash suffix in an HIBP range response.
+        
+        Response format: SUFFIX:COUNT (one per line). The raw bytes are searched
+        directly instead of decoding and splitting the whole (~20KB) body.
+        
+        Args:
+            data: Raw range response body
+            hash_suffix: Remaining 35 hex characters of the SHA-1 hash
+        
+        Returns:
+            Breach count as a string, or None if the suffix is absent
+        """
+        needle = (hash_suffix + ':').encode('ascii')
+        idx = data.find(needle)
+        if idx == -1:
+            return None
+        end = data.find(b'\n', idx)
+        if end == -1:
+            end = len(data)
+        return data[idx + len(needle):end].strip().decode('ascii', errors='replace')
     
     def add_to_blacklist(self, password: str):
         """
@@ -127,5 +423,11 @@ class BreachChecker:
         Args:
             password: Password to add
         """
-        self.blacklist.add(password.lower())
+        password_key = self._blacklist_key(password)
+        with self._blacklist_lock:
+            # Add to the Bloom filter first so a concurrent lookup that sees
+            # the new set can never be rejected by the filter
+            if self._bloom is not None:
+                self._bloom.add(password_key)
+            self.blacklist = self.blacklist | {password_key}
 
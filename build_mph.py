@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Build a minimal perfect hash table for the breach blacklist.
+
+Converts the blacklist text file into a sibling .mph file (e.g.
+data/top_10k_passwords.mph), which BreachChecker memory-maps instead of
+loading the blacklist into a Python set. Re-run after changing the blacklist;
+a stale .mph (older than the text file) is ignored.
+
+For blacklists large enough to use a Bloom filter pre-check, the filter is
+saved as a sibling .bloom file too, so it isn't rebuilt on every start.
+"""
+
+import argparse
+from pathlib import Path
+
+from bloom import BloomFilter
+from config import BLACKLIST_FILE, BREACH_CONFIG
+from mph import build_mph
+from wordlist import load_wordlist
+
+
+def main():
+    """Main build function."""
+    parser = argparse.ArgumentParser(
+        description="Build a minimal perfect hash table for a password blacklist"
+    )
+    parser.add_argument(
+        "blacklist",
+        nargs="?",
+        default=BLACKLIST_FILE,
+        help="Path to breach blacklist file"
+    )
+    args = parser.parse_args()
+    
+    blacklist_path = Path(args.blacklist)
+    if not blacklist_path.exists():
+        print(f"✗ Blacklist not found at {blacklist_path} (run setup_data.py first)")
+        return
+    
+    mph_path = blacklist_path.with_suffix(".mph")
+    passwords = load_wordlist(str(blacklist_path), as_bytes=True)
+    try:
+        build_mph(passwords, str(mph_path))
+    except ValueError as e:
+        # No table written; BreachChecker keeps loading the blacklist as a set
+        print(f"✗ {e}; the blacklist will be loaded as a set instead")
+        return
+    print(f"✓ Built perfect hash table with {len(passwords)} passwords at {mph_path}")
+    
+    if len(passwords) >= BREACH_CONFIG["bloom_min_entries"]:
+        bloom_path = blacklist_path.with_suffix(".bloom")
+        BloomFilter.from_items(
+            passwords, len(passwords), BREACH_CONFIG["bloom_error_rate"]
+        ).save(str(bloom_path))
+        print(f"✓ Saved Bloom filter at {bloom_path}")
+
+
+if __name__ == "__main__":
+    main()
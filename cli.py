@@ -8,21 +8,54 @@ Provides a simple CLI for testing and using the password evaluator.
 import argparse
 import json
 import sys
-from pathlib import Path
 
+from config import BLACKLIST_FILE, PATTERN_THRESHOLDS, WORDLIST_FILE
 from evaluator import PasswordEvaluator
+from wordlist import load_wordlist
 
 
-def load_dictionary_words(wordlist_file: str) -> set:
-    """Load dictionary words from file."""
-    wordlist_path = Path(wordlist_file)
-    if wordlist_path.exists():
-        try:
-            with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return {line.strip().lower() for line in f if line.strip()}
-        except Exception as e:
-            print(f"Warning: Could not load wordlist: {e}", file=sys.stderr)
-    return set()
+def load_dictionary_words(wordlist_file: str) -> frozenset:
+    """
+    Load dictionary words from file (cached on disk as a pickle).
+    
+    Words outside the length range the pattern detector checks are dropped
+    at load time, keeping the set small.
+    """
+    try:
+        return load_wordlist(
+            wordlist_file,
+            min_length=PATTERN_THRESHOLDS["min_dictionary_word_length"],
+            max_length=PATTERN_THRESHOLDS["max_dictionary_word_length"],
+        )
+    except Exception as e:
+        print(f"Warning: Could not load wordlist: {e}", file=sys.stderr)
+    return frozenset()
+
+
+def run_batch(args: argparse.Namespace):
+    """Evaluate every password in a file and print one line per password."""
+    try:
+        with open(args.batch, 'r', encoding='utf-8', errors='ignore') as f:
+            passwords = [line.rstrip('\r\n') for line in f]
+    except OSError as e:
+        print(f"Error: Could not read batch file: {e}", file=sys.stderr)
+        sys.exit(1)
+    passwords = [password for password in passwords if password]
+    
+    evaluator = PasswordEvaluator(
+        dictionary_words=load_dictionary_words(args.wordlist),
+        blacklist_file=args.blacklist
+    )
+    results = evaluator.evaluate_batch(passwords, args.username, args.email)
+    
+    if args.json:
+        print(json.dumps(
+            [dict(result, password=password) for password, result in zip(passwords, results)],
+            indent=2
+        ))
+    else:
+        for password, result in zip(passwords, results):
+            print(f"{result['score']:>3}  {result['strength']:<11}  {password}")
 
 
 def main():
@@ -45,12 +78,12 @@ def main():
     )
     parser.add_argument(
         "--wordlist",
-        default="data/common_words.txt",
+        default=WORDLIST_FILE,
         help="Path to dictionary wordlist file"
     )
     parser.add_argument(
         "--blacklist",
-        default="data/top_10k_passwords.txt",
+        default=BLACKLIST_FILE,
         help="Path to breach blacklist file"
     )
     parser.add_argument(
@@ -58,9 +91,18 @@ def main():
         action="store_true",
         help="Output results as JSON"
     )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Evaluate every password in FILE (one per line) instead of a single password"
+    )
     
     args = parser.parse_args()
     
+    if args.batch:
+        run_batch(args)
+        return
+    
     # Get password
     password = args.password
     if not password:
@@ -6,6 +6,8 @@ This ensures maintainability and allows security policies to be adjusted without
 modifying core logic.
 """
 
+import math
+import os
 from typing import Dict, List
 
 # Scoring thresholds
@@ -35,6 +37,9 @@ PATTERN_THRESHOLDS = {
     "min_keyboard_pattern_length": 4,  # Minimum keyboard pattern length
     "max_year_range": (1900, 2099),  # Year pattern detection range
     "min_dictionary_word_length": 4,  # Minimum word length to check in dictionary
+    "max_dictionary_word_length": 32,  # Longer wordlist entries are dropped at load time
+    "dictionary_bloom_min_entries": 100_000,  # Dictionary size from which a Bloom filter pre-check is used
+    "dictionary_bloom_error_rate": 0.01,  # Dictionary Bloom filter false positive rate
 }
 
 # Penalty weights for different pattern types
@@ -55,25 +60,53 @@ BREACH_CONFIG = {
     "hibp_api_url": "https://api.pwnedpasswords.com/range/",
     "hibp_enabled": False,  # Set to True to enable HIBP API (requires internet)
     "breach_force_weak": True,  # Force WEAK classification if breached
+    "hibp_cache_size": 1024,  # Recent HIBP results kept in memory (0 disables)
+    "bloom_min_entries": 100_000,  # Blacklist size from which a Bloom filter pre-check is used
+    "bloom_error_rate": 0.01,  # Bloom filter false positive rate
 }
 
-# File paths
-DATA_DIR = "data"
-WORDLIST_FILE = f"{DATA_DIR}/common_words.txt"
-BLACKLIST_FILE = f"{DATA_DIR}/top_10k_passwords.txt"
+# File paths. The data files ship with the repository and are resolved
+# relative to this module, so they are found from any working directory.
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+WORDLIST_FILE = os.path.join(DATA_DIR, "common_words.txt")
+BLACKLIST_FILE = os.path.join(DATA_DIR, "top_10k_passwords.txt")
 
 # Similarity check configuration
 SIMILARITY_THRESHOLD = 0.5  # Minimum similarity ratio to flag username/email match
 
+# Recent PasswordEvaluator.evaluate results kept in memory (0 disables).
+# Cached results include issue strings that can quote the password, so this
+# many recent passwords stay recoverable from process memory
+EVALUATION_CACHE_SIZE = 4096
+
 # Character variety thresholds
 MIN_CHAR_VARIETY_RATIO = 0.3  # Minimum unique chars / total length ratio
 
+# Batch evaluation limits
+MAX_BATCH_SIZE = 1000  # Maximum passwords per /api/evaluate_batch request
+
+# Pool size for each combination of character classes, indexed by
+# has_lower | has_upper << 1 | has_digit << 2 | has_special << 3
+# (minimum 1 to prevent division by zero)
+_CHAR_POOL_TABLE = tuple(
+    max(1,
+        CHAR_POOL_SIZES["lowercase"] * (i & 1)
+        + CHAR_POOL_SIZES["uppercase"] * ((i >> 1) & 1)
+        + CHAR_POOL_SIZES["digits"] * ((i >> 2) & 1)
+        + CHAR_POOL_SIZES["special"] * ((i >> 3) & 1))
+    for i in range(16)
+)
+
+# log2 of each pool size, so entropy calculation skips the libm call
+_CHAR_POOL_LOG2_TABLE = tuple(math.log2(size) for size in _CHAR_POOL_TABLE)
+
 def get_char_pool_size(has_lower: bool, has_upper: bool, has_digit: bool, has_special: bool) -> int:
     """
     Calculate character pool size based on detected character classes.
     
     This is critical for accurate entropy calculation. The pool size directly
     affects entropy, which is the foundation of password strength assessment.
+    Only 16 combinations exist, so the sizes are precomputed in a table.
     
     Args:
         has_lower: Whether password contains lowercase letters
@@ -84,16 +117,20 @@ def get_char_pool_size(has_lower: bool, has_upper: bool, has_digit: bool, has_sp
     Returns:
         Total character pool size available for password generation
     """
-    pool_size = 0
-    if has_lower:
-        pool_size += CHAR_POOL_SIZES["lowercase"]
-    if has_upper:
-        pool_size += CHAR_POOL_SIZES["uppercase"]
-    if has_digit:
-        pool_size += CHAR_POOL_SIZES["digits"]
-    if has_special:
-        pool_size += CHAR_POOL_SIZES["special"]
-    
-    # Minimum pool size to prevent division by zero
-    return max(pool_size, 1)
+    return _CHAR_POOL_TABLE[has_lower | has_upper << 1 | has_digit << 2 | has_special << 3]
+
 
+def get_char_pool_log2(has_lower: bool, has_upper: bool, has_digit: bool, has_special: bool) -> float:
+    """
+    Return log2 of the character pool size (bits of entropy per character).
+    
+    Args:
+        has_lower: Whether password contains lowercase letters
+        has_upper: Whether password contains uppercase letters
+        has_digit: Whether password contains digits
+        has_special: Whether password contains special characters
+    
+    Returns:
+        log2 of the total character pool size
+    """
+    return _CHAR_POOL_LOG2_TABLE[has_lower | has_upper << 1 | has_digit << 2 | has_special << 3]
@@ -12,9 +12,23 @@ entropy is high.
 """
 
 import math
+from collections import Counter
 from typing import Dict, Tuple
 
-from config import get_char_pool_size, ENTROPY_PENALTY_MULTIPLIER
+from config import get_char_pool_size, get_char_pool_log2, ENTROPY_PENALTY_MULTIPLIER
+
+# Special characters counted towards the "special" character pool
+SPECIAL_CHARACTERS = "!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"
+
+# Translation table deleting special characters; str.translate runs in C, so
+# comparing lengths before/after is a fast "contains a special char" test
+_SPECIAL_DELETE_TABLE = str.maketrans('', '', SPECIAL_CHARACTERS)
+
+# From this length on, character classes are detected on the set of unique
+# characters instead of the raw password. Building the set runs in C and long
+# passphrases repeat characters heavily, so far fewer Python-level iterations
+# are needed; for short passwords the set construction isn't worth it.
+UNIQUE_SCAN_MIN_LENGTH = 32
 
 
 class EntropyCalculator:
@@ -44,18 +58,31 @@ class EntropyCalculator:
                 "has_special": False,
             }
         
-        # Detect character classes
-        has_lower = any(c.islower() for c in password)
-        has_upper = any(c.isupper() for c in password)
-        has_digit = any(c.isdigit() for c in password)
-        has_special = any(c in "!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~" for c in password)
+        # Detect special characters in C via str.translate
+        has_special = len(password.translate(_SPECIAL_DELETE_TABLE)) < len(password)
+        
+        # Detect remaining character classes in a single pass, stopping early
+        # once every class has been seen
+        chars = set(password) if len(password) >= UNIQUE_SCAN_MIN_LENGTH else password
+        has_lower = has_upper = has_digit = False
+        for c in chars:
+            if c.islower():
+                has_lower = True
+            elif c.isupper():
+                has_upper = True
+            elif c.isdigit():
+                has_digit = True
+            else:
+                continue
+            if has_lower and has_upper and has_digit:
+                break
         
         # Calculate character pool size
         pool_size = get_char_pool_size(has_lower, has_upper, has_digit, has_special)
         
         # Calculate base entropy: H = L * log2(N)
         length = len(password)
-        base_entropy = length * math.log2(pool_size)
+        base_entropy = length * get_char_pool_log2(has_lower, has_upper, has_digit, has_special)
         
         # Apply penalty if patterns detected
         # Patterns reduce effective entropy because they make passwords predictable
@@ -95,19 +122,16 @@ class EntropyCalculator:
         if not password:
             return 0.0
         
-        # Character frequency analysis
-        char_counts = {}
-        for char in password:
-            char_counts[char] = char_counts.get(char, 0) + 1
+        # Character frequency analysis (Counter tallies in C)
+        char_counts = Counter(password)
         
         # Calculate entropy using frequency distribution
         length = len(password)
         entropy = 0.0
         
-        for char, count in char_counts.items():
+        for count in char_counts.values():
             probability = count / length
-            if probability > 0:
-                entropy -= probability * math.log2(probability)
+            entropy -= probability * math.log2(probability)
         
         # Multiply by length to get total entropy
         return entropy * length
@@ -8,8 +8,14 @@ This is the primary interface for password evaluation. It coordinates all
 security modules to produce a unified, explainable result.
 """
 
-from typing import Dict, List, Optional
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
+from config import EVALUATION_CACHE_SIZE
 from patterns import PatternDetector
 from entropy import EntropyCalculator
 from breach import BreachChecker
@@ -32,27 +38,43 @@ class PasswordEvaluator:
         self.entropy_calculator = EntropyCalculator()
         self.breach_checker = BreachChecker(blacklist_file)
         self.scorer = PasswordScorer()
+        
+        # LRU cache of recent evaluations, keyed by a keyed BLAKE2b digest of
+        # the inputs. The keys reveal nothing, but the cached results do
+        # contain password fragments (dictionary, year and similarity issues
+        # quote parts of the password); set EVALUATION_CACHE_SIZE to 0 to
+        # keep nothing in memory
+        self._results_cache: "OrderedDict[bytes, Dict]" = OrderedDict()
+        self._results_cache_key = os.urandom(16)
+        self._results_cache_lock = threading.Lock()
     
     def evaluate(
         self,
         password: str,
         username: Optional[str] = None,
-        email: Optional[str] = None
+        email: Optional[str] = None,
+        breach_result: Optional[Tuple[bool, Optional[str]]] = None
     ) -> Dict:
         """
         Evaluate password strength comprehensively.
         
         This is the main entry point for password evaluation. It:
-        1. Detects weak patterns
-        2. Calculates entropy
-        3. Checks breach databases
+        1. Checks breach databases
+        2. Detects weak patterns
+        3. Calculates entropy
         4. Computes score and classification
         5. Generates recommendations
         
+        Results are cached per evaluator, so repeated evaluations of the same
+        inputs skip steps 2-5.
+        
         Args:
             password: Password to evaluate
             username: Optional username for similarity checks
             email: Optional email for similarity checks
+            breach_result: Precomputed (is_breached, reason) for this password,
+                           e.g. from BreachChecker.check_breach_batch. If None,
+                           breach databases are checked here.
         
         Returns:
             Dictionary with evaluation results:
@@ -77,18 +99,60 @@ class PasswordEvaluator:
                 "breach_reason": None,
             }
         
-        # Step 1: Detect patterns
-        pattern_issues = self.pattern_detector.detect_all(password, username, email)
+        # Lowercased once and shared by the breach and pattern checks
+        password_lower = password.lower()
+        
+        # Step 1: Check breach databases. Done before the cache lookup, so a
+        # password added to the blacklist is never served a stale result.
+        if breach_result is None:
+            breach_result = self.breach_checker.check_breach(password, password_lower)
+        
+        if EVALUATION_CACHE_SIZE <= 0:
+            return self._evaluate(password, password_lower, username, email, breach_result)
+        
+        # Evaluation is deterministic for given inputs, and the same password
+        # is often evaluated repeatedly (e.g. on every keystroke)
+        digest = hashlib.blake2b(
+            repr((password, username, email, breach_result)).encode('utf-8'),
+            digest_size=16, key=self._results_cache_key
+        ).digest()
+        with self._results_cache_lock:
+            cached = self._results_cache.get(digest)
+            if cached is not None:
+                self._results_cache.move_to_end(digest)
+        
+        if cached is None:
+            cached = self._evaluate(password, password_lower, username, email, breach_result)
+            with self._results_cache_lock:
+                self._results_cache[digest] = cached
+                while len(self._results_cache) > EVALUATION_CACHE_SIZE:
+                    self._results_cache.popitem(last=False)
+        
+        # Copy so callers can't modify the cached result
+        return self._copy_result(cached)
+    
+    def _evaluate(
+        self,
+        password: str,
+        password_lower: str,
+        username: Optional[str],
+        email: Optional[str],
+        breach_result: Tuple[bool, Optional[str]]
+    ) -> Dict:
+        """Evaluate a non-empty password whose breach status is known (uncached evaluate)."""
+        is_breached, breach_reason = breach_result
+        
+        # Step 2: Detect patterns
+        pattern_issues = self.pattern_detector.detect_all(
+            password, username, email, password_lower=password_lower
+        )
         has_patterns = bool(pattern_issues)
         
-        # Step 2: Calculate entropy
+        # Step 3: Calculate entropy
         entropy_bits, char_classes = self.entropy_calculator.calculate_entropy(
             password, has_patterns
         )
         
-        # Step 3: Check breach databases
-        is_breached, breach_reason = self.breach_checker.check_breach(password)
-        
         # Step 4: Calculate score
         score = self.scorer.calculate_score(
             entropy_bits,
@@ -131,4 +195,59 @@ class PasswordEvaluator:
             "is_breached": is_breached,
             "breach_reason": breach_reason,
         }
+    
+    @staticmethod
+    def _copy_result(result: Dict) -> Dict:
+        """Copy an evaluation result, including its lists."""
+        result = dict(result)
+        result["issues"] = list(result["issues"])
+        result["recommendations"] = list(result["recommendations"])
+        return result
+    
+    def evaluate_batch(
+        self,
+        passwords: List[str],
+        username: Optional[str] = None,
+        email: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Evaluate many passwords, e.g. when auditing a wordlist.
+        
+        Duplicate passwords are only evaluated once; each occurrence gets its
+        own copy of the result. Breach checks are batched, so HIBP lookups
+        sharing a hash prefix cost a single query.
+        
+        Args:
+            passwords: Passwords to evaluate
+            username: Optional username for similarity checks
+            email: Optional email for similarity checks
+        
+        Returns:
+            List of evaluation results (see evaluate), in input order
+        """
+        unique_passwords = [password for password in dict.fromkeys(passwords) if password]
+        breach_results = self.breach_checker.check_breach_batch(unique_passwords)
+        
+        unique_results: Dict[str, Dict] = {}
+        for password, breach_result in zip(unique_passwords, breach_results):
+            unique_results[password] = self.evaluate(password, username, email, breach_result)
+        if "" in passwords:
+            unique_results[""] = self.evaluate("")
+        
+        return [self._copy_result(unique_results[password]) for password in passwords]
+
 
+@functools.cache
+def get_evaluator() -> PasswordEvaluator:
+    """
+    Return the shared default PasswordEvaluator, created on first call.
+    
+    Callers that want the default configuration share one instance, so the
+    blacklist is loaded and the result caches are warmed once per process.
+    Build a PasswordEvaluator directly for a custom configuration, or for one
+    that is going to be modified.
+    
+    Returns:
+        Process-wide PasswordEvaluator with default settings
+    """
+    return PasswordEvaluator()
@@ -7,10 +7,13 @@ Demonstrates various use cases and password evaluation scenarios.
 
 from evaluator import PasswordEvaluator
 
+# Build the evaluator once and reuse it: construction loads the breach
+# blacklist from disk, which shouldn't be repeated for every password
+evaluator = PasswordEvaluator()
+
 
 def print_evaluation(password: str, username: str = None, email: str = None):
     """Print formatted evaluation results."""
-    evaluator = PasswordEvaluator()
     result = evaluator.evaluate(password, username, email)
     
     print(f"\n{'=' * 60}")
@@ -0,0 +1,23 @@
+"""
+Gunicorn configuration for serving the password evaluation web app.
+
+Usage:
+    gunicorn -c gunicorn_conf.py app:app
+
+The app is preloaded in the master process, so the dictionary wordlist and
+breach blacklist are loaded once and then shared by all workers through
+fork's copy-on-write pages, instead of every worker loading its own copy.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5001")
+
+# Load app.py (and with it the wordlists) once in the master before forking
+preload_app = True
+
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+
+# Threads let a worker keep serving while a request waits on the HIBP API
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
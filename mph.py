@@ -0,0 +1,220 @@
+"""
+Minimal perfect hash module for password strength evaluation.
+
+Builds and reads a compact, memory-mapped lookup table for static wordlists
+such as the breach blacklist. Every entry maps to its own slot (no collisions,
+no empty slots), so a lookup is one hash plus one byte comparison.
+
+File layout (all integers little-endian):
+    magic        4 bytes  b"MPH1"
+    num_keys     uint32   n
+    num_buckets  uint32   r
+    seed         uint32   hash seed the table was built with (0 for tables
+                          from before seeds; also keeps the tables below aligned)
+    displace     r x uint64   per-bucket displacement
+    offsets      (n+1) x uint32  start of each slot's key in the key blob
+    keys         concatenated key bytes, in slot order
+
+Performance rationale: A Python set spends 100+ bytes per entry on object and
+hash-table overhead. This table needs ~6 bytes per entry plus the raw key
+bytes, and is shared read-only between processes via the page cache.
+"""
+
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+MAGIC = b"MPH1"
+_HEADER = struct.Struct("<4sIII")
+
+# Average number of keys per bucket; larger buckets shrink the displacement
+# table but make the build search longer
+KEYS_PER_BUCKET = 4
+
+# Displacement rounds (values of d0) tried per bucket before giving up on a
+# seed. Two keys whose slot hashes agree modulo n can never be separated, so
+# the search must be bounded; a new seed rehashes every key.
+MAX_DISPLACEMENT_ROUNDS = 256
+
+# Hash seeds tried before the build fails
+MAX_SEEDS = 32
+
+
+def _salt(seed: int) -> bytes:
+    """BLAKE2b salt for a hash seed; seed 0 is BLAKE2b's default (all-zero) salt."""
+    return seed.to_bytes(hashlib.blake2b.SALT_SIZE, 'little')
+
+
+def _hashes(key: bytes, salt: bytes = _salt(0)) -> Tuple[int, int, int]:
+    """Derive the bucket hash and two slot hashes for a key from one digest."""
+    digest = hashlib.blake2b(key, digest_size=24, salt=salt).digest()
+    return (
+        int.from_bytes(digest[:8], 'little'),
+        int.from_bytes(digest[8:16], 'little'),
+        int.from_bytes(digest[16:], 'little'),
+    )
+
+
+def _slot(h1: int, h2: int, displacement: int, num_keys: int) -> int:
+    """Map a key's slot hashes and its bucket displacement to a slot."""
+    d0, d1 = divmod(displacement, num_keys)
+    return (h1 + d0 * h2 + d1) % num_keys
+
+
+def _place(keys: List[bytes], num_buckets: int,
+           seed: int) -> Optional[Tuple[List[int], List[bytes]]]:
+    """
+    Search displacements for every bucket with one hash seed.
+
+    Returns:
+        (per-bucket displacements, keys in slot order), or None if some bucket
+        couldn't be placed within MAX_DISPLACEMENT_ROUNDS
+    """
+    num_keys = len(keys)
+    salt = _salt(seed)
+    buckets: List[List[Tuple[bytes, int, int]]] = [[] for _ in range(num_buckets)]
+    for key in keys:
+        h0, h1, h2 = _hashes(key, salt)
+        buckets[h0 % num_buckets].append((key, h1, h2))
+
+    displace = [0] * num_buckets
+    slots: List[bytes] = [b""] * num_keys
+    taken = bytearray(num_keys)
+    # Free slots, with each slot's index in the list for O(1) swap-removal
+    free = list(range(num_keys))
+    free_index = list(range(num_keys))
+
+    order = sorted(range(num_buckets), key=lambda b: len(buckets[b]), reverse=True)
+    for bucket_idx in order:
+        bucket = buckets[bucket_idx]
+        if not bucket:
+            continue
+
+        # Keys agreeing on both slot hashes modulo n collide under every
+        # displacement; only a new seed can separate them
+        if len({(h1 % num_keys, h2 % num_keys) for _, h1, h2 in bucket}) < len(bucket):
+            return None
+
+        # Try displacements (d0, d1) with d1 chosen so that the first key lands
+        # on a free slot, rather than blindly counting through every d1
+        for d0 in range(MAX_DISPLACEMENT_ROUNDS):
+            bases = [(h1 + d0 * h2) % num_keys for _, h1, h2 in bucket]
+            for target in free:
+                d1 = (target - bases[0]) % num_keys
+                positions = [(base + d1) % num_keys for base in bases]
+                if len(set(positions)) == len(positions) and not any(taken[p] for p in positions):
+                    break
+            else:
+                continue
+            break
+        else:
+            return None
+
+        displace[bucket_idx] = d0 * num_keys + d1
+        for (key, _, _), pos in zip(bucket, positions):
+            slots[pos] = key
+            taken[pos] = 1
+            # Swap-remove pos from the free list
+            idx = free_index[pos]
+            last = free.pop()
+            if last != pos:
+                free[idx] = last
+                free_index[last] = idx
+
+    return displace, slots
+
+
+def build_mph(keys: Iterable[bytes], path: str):
+    """
+    Build a minimal perfect hash table for a set of keys and write it to disk.
+
+    Uses hash-and-displace: keys are grouped into buckets, and buckets are
+    placed largest first, each searching for a displacement that sends all of
+    its keys to free slots. A key in a bucket with displacement d lands on slot
+    (h1 + d0*h2 + d1) mod n, where (d0, d1) = divmod(d, n). If some bucket
+    can't be placed, every key is rehashed with the next seed.
+
+    Args:
+        keys: Unique keys to store
+        path: Output file path
+
+    Raises:
+        ValueError: If no seed up to MAX_SEEDS yields a table (nothing is
+            written; callers should keep using a plain set)
+    """
+    keys = sorted(set(keys))
+    num_keys = len(keys)
+    num_buckets = max(1, (num_keys + KEYS_PER_BUCKET - 1) // KEYS_PER_BUCKET)
+
+    for seed in range(MAX_SEEDS):
+        placed = _place(keys, num_buckets, seed)
+        if placed is not None:
+            break
+    else:
+        raise ValueError(f"Could not build a perfect hash table for {num_keys} keys")
+    displace, slots = placed
+
+    offsets = [0]
+    for key in slots:
+        offsets.append(offsets[-1] + len(key))
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, num_keys, num_buckets, seed))
+        f.write(struct.pack(f"<{num_buckets}Q", *displace))
+        f.write(struct.pack(f"<{num_keys + 1}I", *offsets))
+        f.write(b"".join(slots))
+
+
+class PerfectHashTable:
+    """Read-only, memory-mapped minimal perfect hash table."""
+
+    def __init__(self, path: str):
+        """
+        Open a table written by build_mph.
+
+        Args:
+            path: Path to the .mph file
+
+        Raises:
+            ValueError: If the file is not a valid table
+        """
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.num_keys, self.num_buckets, seed = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a perfect hash table: {path}")
+        self._salt = _salt(seed)
+
+        # The small index tables are copied into arrays; the key blob stays
+        # in the memory map
+        displace_start = _HEADER.size
+        offsets_start = displace_start + 8 * self.num_buckets
+        self._keys_start = offsets_start + 4 * (self.num_keys + 1)
+        self._displace = array('Q', self._mm[displace_start:offsets_start])
+        self._offsets = array('I', self._mm[offsets_start:self._keys_start])
+        if sys.byteorder != 'little':
+            self._displace.byteswap()
+            self._offsets.byteswap()
+
+    def __len__(self) -> int:
+        return self.num_keys
+
+    def __contains__(self, key: bytes) -> bool:
+        if not self.num_keys:
+            return False
+        h0, h1, h2 = _hashes(key, self._salt)
+        pos = _slot(h1, h2, self._displace[h0 % self.num_buckets], self.num_keys)
+        start = self._keys_start + self._offsets[pos]
+        end = self._keys_start + self._offsets[pos + 1]
+        return end - start == len(key) and self._mm[start:end] == key
+
+    def __iter__(self) -> Iterator[bytes]:
+        keys_start = self._keys_start
+        offsets = self._offsets
+        for pos in range(self.num_keys):
+            yield self._mm[keys_start + offsets[pos]:keys_start + offsets[pos + 1]]
@@ -16,11 +16,14 @@ capture predictability. A password with high entropy but obvious patterns is
 vulnerable to pattern-based attacks.
 """
 
+import functools
+import itertools
 import re
 import string
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Dict, FrozenSet, Iterator, List, Pattern, Set, Tuple, Optional
 from difflib import SequenceMatcher
 
+from bloom import BloomFilter
 from config import (
     PATTERN_THRESHOLDS,
     PATTERN_PENALTIES,
@@ -28,6 +31,136 @@ from config import (
     MIN_CHAR_VARIETY_RATIO,
 )
 
+# Pattern types in the order they are reported
+PATTERN_TYPES = (
+    "repeated_chars",
+    "sequential_chars",
+    "keyboard_pattern",
+    "leetspeak",
+    "dictionary_word",
+    "year_pattern",
+    "username_similarity",
+    "low_variety",
+)
+
+# Common leetspeak spellings, as (group name, regex, word it resembles)
+_LEET_PATTERNS = (
+    ("admin", r'[a@]dm[i1]n', 'admin'),
+    ("passwd", r'p[@a]ssw[o0]rd', 'password'),
+    ("love", r'[l1]0v3', 'love'),
+    ("hack", r'[h4]ack', 'hack'),
+    ("test", r'[t7]est', 'test'),
+)
+
+# All leetspeak spellings as one alternation, scanned in a single pass. The
+# lookahead makes matches zero-width, so overlapping spellings are all found.
+_LEET_RE = re.compile(
+    "(?=(?:" + "|".join(f"(?P<{name}>{regex})" for name, regex, _ in _LEET_PATTERNS) + "))"
+)
+
+# Issue label for each (character kind, step) of a sequential run
+_SEQUENCE_LABELS = {
+    ("alpha", 1): "ascending",
+    ("alpha", -1): "descending",
+    ("digit", 1): "numerical",
+    ("digit", -1): "numerical descending",
+}
+
+# Optional: Aho-Corasick automaton for multi-word dictionary search
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional: compiled character-level detectors (see patterns_core.pyx)
+try:
+    import patterns_core
+except ImportError:
+    patterns_core = None
+
+# Optional: C++ similarity ratio, falling back to difflib
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
+
+def _encode(text: str) -> bytes:
+    """UTF-8 encode text, passing through lone surrogates (e.g. from JSON input)."""
+    return text.encode('utf-8', errors='surrogatepass')
+
+
+def _similarity_ratio(a: str, b: str) -> float:
+    """
+    Similarity ratio of two strings in [0, 1].
+    
+    Two strings can share at most min(len) characters, so the ratio can't
+    exceed 2 * min(len) / (len(a) + len(b)). When that bound is already below
+    SIMILARITY_THRESHOLD the bound is returned without computing the ratio;
+    callers only compare the result against the threshold.
+    """
+    total = len(a) + len(b)
+    if not total:
+        return 1.0
+    
+    upper_bound = 2 * min(len(a), len(b)) / total
+    if upper_bound < SIMILARITY_THRESHOLD:
+        return upper_bound
+    
+    if fuzz is not None:
+        return fuzz.ratio(a, b) / 100.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+@functools.lru_cache(maxsize=None)
+def _build_keyboard_patterns(rows: Tuple[str, ...], min_len: int) -> Tuple[FrozenSet[str], Pattern]:
+    """
+    Build forward and reverse keyboard patterns for detection.
+    
+    The result depends only on the keyboard rows and pattern length, so it is
+    built once and shared by every PatternDetector.
+    
+    Args:
+        rows: Keyboard rows, top to bottom
+        min_len: Keyboard pattern length
+    
+    Returns:
+        Tuple of (set of patterns, compiled regex matching any pattern)
+    """
+    patterns = set()
+    
+    # Forward patterns
+    for row in rows:
+        for i in range(len(row) - min_len + 1):
+            pattern = row[i:i + min_len]
+            patterns.add(pattern)
+            patterns.add(pattern.upper())
+    
+    # Reverse patterns
+    for row in rows:
+        reversed_row = row[::-1]
+        for i in range(len(reversed_row) - min_len + 1):
+            pattern = reversed_row[i:i + min_len]
+            patterns.add(pattern)
+            patterns.add(pattern.upper())
+    
+    # Column patterns (less common but still weak)
+    for col_idx in range(10):
+        col_pattern = ""
+        for row in rows[:3]:  # Only letter rows
+            if col_idx < len(row):
+                col_pattern += row[col_idx]
+        if len(col_pattern) >= min_len:
+            patterns.add(col_pattern)
+            patterns.add(col_pattern.upper())
+    
+    # All patterns as one alternation scanned in a single pass. Patterns
+    # all have the same length and may overlap, so matches are zero-width
+    # lookaheads capturing the pattern.
+    regex = re.compile("(?=(" + "|".join(map(re.escape, sorted(patterns))) + "))")
+    
+    return frozenset(patterns), regex
+
 
 class PatternDetector:
     """Detects weak patterns in passwords."""
@@ -52,6 +185,9 @@ class PatternDetector:
         'z': ['2'],
     }
     
+    # Every character that appears as a leetspeak substitution
+    _LEET_CHARS = frozenset(ch for subs in LEETSPEAK_MAP.values() for ch in subs)
+    
     def __init__(self, dictionary_words: Optional[Set[str]] = None):
         """
         Initialize pattern detector.
@@ -60,40 +196,72 @@ class PatternDetector:
             dictionary_words: Set of common dictionary words to check against.
                              If None, will use empty set (dictionary check disabled).
         """
-        self.dictionary_words = dictionary_words or set()
-        self._build_keyboard_patterns()
+        # Words are stored UTF-8 encoded: bytes objects are smaller than str
+        # and hash faster. Words shorter than the minimum length are never
+        # reported, so they are dropped here.
+        min_word_len = PATTERN_THRESHOLDS["min_dictionary_word_length"]
+        self.dictionary_words: FrozenSet[bytes] = frozenset(
+            _encode(word) for word in (dictionary_words or ()) if len(word) >= min_word_len
+        )
+        # Word lengths (in bytes) that occur in the dictionary; only
+        # substrings of these lengths are worth looking up
+        self._dict_word_lengths = tuple(sorted({len(word) for word in self.dictionary_words}))
+        self._dict_bloom = self._build_dictionary_bloom()
+        self._dict_automaton = self._build_dictionary_automaton()
+        self.keyboard_patterns, self._keyboard_re = _build_keyboard_patterns(
+            tuple(self.KEYBOARD_ROWS), PATTERN_THRESHOLDS["min_keyboard_pattern_length"]
+        )
+
+    
+    def _build_dictionary_bloom(self) -> Optional[BloomFilter]:
+        """
+        Build a Bloom filter front-end for large dictionaries.
+        
+        Small dictionaries skip the filter: a single set lookup is already
+        cheaper than computing the filter's hashes.
+        
+        Returns:
+            Bloom filter over the dictionary words, or None
+        """
+        if len(self.dictionary_words) < PATTERN_THRESHOLDS["dictionary_bloom_min_entries"]:
+            return None
+        return BloomFilter.from_items(
+            self.dictionary_words, len(self.dictionary_words),
+            PATTERN_THRESHOLDS["dictionary_bloom_error_rate"]
+        )
     
-    def _build_keyboard_patterns(self):
-        """Build forward and reverse keyboard patterns for detection."""
-        self.keyboard_patterns = set()
-        
-        # Forward patterns
-        for row in self.KEYBOARD_ROWS:
-            for i in range(len(row) - PATTERN_THRESHOLDS["min_keyboard_pattern_length"] + 1):
-                pattern = row[i:i + PATTERN_THRESHOLDS["min_keyboard_pattern_length"]]
-                self.keyboard_patterns.add(pattern)
-                self.keyboard_patterns.add(pattern.upper())
-        
-        # Reverse patterns
-        for row in self.KEYBOARD_ROWS:
-            reversed_row = row[::-1]
-            for i in range(len(reversed_row) - PATTERN_THRESHOLDS["min_keyboard_pattern_length"] + 1):
-                pattern = reversed_row[i:i + PATTERN_THRESHOLDS["min_keyboard_pattern_length"]]
-                self.keyboard_patterns.add(pattern)
-                self.keyboard_patterns.add(pattern.upper())
-        
-        # Column patterns (less common but still weak)
-        for col_idx in range(10):
-            col_pattern = ""
-            for row in self.KEYBOARD_ROWS[:3]:  # Only letter rows
-                if col_idx < len(row):
-                    col_pattern += row[col_idx]
-            if len(col_pattern) >= PATTERN_THRESHOLDS["min_keyboard_pattern_length"]:
-                self.keyboard_patterns.add(col_pattern)
-                self.keyboard_patterns.add(col_pattern.upper())
+    def _dict_contains(self, word: bytes) -> bool:
+        """Check an encoded, lowercased string against the dictionary."""
+        # The Bloom filter, if any, rejects most non-words first
+        if self._dict_bloom is not None and word not in self._dict_bloom:
+            return False
+        return word in self.dictionary_words
+    
+    def _build_dictionary_automaton(self):
+        """
+        Build an Aho-Corasick automaton over the dictionary words.
+        
+        The automaton finds every contained dictionary word in one pass over
+        the password, instead of one substring search per dictionary word.
+        
+        Returns:
+            Automaton, or None if pyahocorasick is unavailable or the
+            dictionary is empty
+        """
+        if ahocorasick is None or not self.dictionary_words:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for word_bytes in self.dictionary_words:
+            word = word_bytes.decode('utf-8', errors='surrogatepass')
+            automaton.add_word(word, word)
+        automaton.make_automaton()
+        return automaton
     
     def detect_all(self, password: str, username: Optional[str] = None, 
-                   email: Optional[str] = None) -> Dict[str, List[str]]:
+                   email: Optional[str] = None,
+                   early_exit_penalty: Optional[int] = None,
+                   password_lower: Optional[str] = None) -> Dict[str, List[str]]:
         """
         Detect all patterns in password.
         
@@ -101,164 +269,147 @@ class PatternDetector:
             password: Password to analyze
             username: Optional username for similarity check
             email: Optional email for similarity check
+            early_exit_penalty: If set, stop running detectors once the
+                                penalties of the pattern types found reach
+                                this total. For callers that only need to
+                                know whether a password is weak; the result
+                                may then omit some pattern types.
+            password_lower: password.lower(), if the caller already has it
         
         Returns:
             Dictionary mapping pattern type to list of detected issues
         """
-        issues = {
-            "repeated_chars": [],
-            "sequential_chars": [],
-            "keyboard_pattern": [],
-            "leetspeak": [],
-            "dictionary_word": [],
-            "year_pattern": [],
-            "username_similarity": [],
-            "low_variety": [],
-        }
-        
-        password_lower = password.lower()
-        
-        # Detect all pattern types
-        issues["repeated_chars"] = self._detect_repeated_chars(password)
-        issues["sequential_chars"] = self._detect_sequential_chars(password)
-        issues["keyboard_pattern"] = self._detect_keyboard_patterns(password_lower)
-        issues["leetspeak"] = self._detect_leetspeak(password_lower)
-        issues["dictionary_word"] = self._detect_dictionary_words(password_lower)
-        issues["year_pattern"] = self._detect_year_patterns(password)
-        issues["username_similarity"] = self._detect_username_similarity(
-            password, username, email
-        )
-        issues["low_variety"] = self._detect_low_variety(password)
+        if password_lower is None:
+            password_lower = password.lower()
+        
+        found = {}
+        penalty = 0
+        for pattern_type, issues in self._run_detectors(password, password_lower, username, email):
+            if issues:
+                found[pattern_type] = issues
+                penalty += PATTERN_PENALTIES.get(pattern_type, 0)
+                if early_exit_penalty is not None and penalty >= early_exit_penalty:
+                    break
         
-        # Remove empty lists
-        return {k: v for k, v in issues.items() if v}
+        # Report pattern types in their canonical order, not detection order
+        return {pattern_type: found[pattern_type] for pattern_type in PATTERN_TYPES
+                if pattern_type in found}
+    
+    def _run_detectors(self, password: str, password_lower: str, username: Optional[str],
+                       email: Optional[str]) -> Iterator[Tuple[str, List[str]]]:
+        """
+        Run each detector in turn, cheapest first.
+        
+        The lowercased password is computed once by the caller and shared by
+        every detector that needs it.
+        
+        Yields:
+            Tuples of (pattern type, list of detected issues)
+        """
+        yield "low_variety", self._detect_low_variety(set(password), len(password))
+        yield "repeated_chars", self._detect_repeated_chars(password)
+        yield "year_pattern", self._detect_year_patterns(password)
+        yield "keyboard_pattern", self._detect_keyboard_patterns(password_lower)
+        yield "sequential_chars", self._detect_sequential_chars(password)
+        yield "leetspeak", self._detect_leetspeak(password_lower)
+        yield "username_similarity", self._detect_username_similarity(
+            password_lower, username, email
+        )
+        yield "dictionary_word", self._detect_dictionary_words(password_lower)
     
     def _detect_repeated_chars(self, password: str) -> List[str]:
         """Detect consecutive repeated characters."""
         issues = []
         min_repeat = PATTERN_THRESHOLDS["min_repeat_length"]
         
-        i = 0
-        while i < len(password):
-            char = password[i]
-            count = 1
-            j = i + 1
-            while j < len(password) and password[j] == char:
-                count += 1
-                j += 1
-            
+        if patterns_core is not None:
+            return patterns_core.detect_repeated(password, min_repeat)
+        
+        for char, run in itertools.groupby(password):
+            count = sum(1 for _ in run)
             if count >= min_repeat:
                 issues.append(f"Repeated character '{char}' {count} times")
-            
-            i = j
         
         return issues
     
     def _detect_sequential_chars(self, password: str) -> List[str]:
-        """Detect sequential character patterns (alphabetical, numerical, descending)."""
+        """
+        Detect sequential character patterns (alphabetical, numerical, descending).
+        
+        Each adjacent character pair is classified once as a step (+1 or -1
+        between letters, or between digits modulo 10 so 9->0 wraps). A window
+        of min_seq characters is sequential exactly when it lies inside a run
+        of min_seq - 1 identical steps, so every window is found from the runs
+        instead of re-checking each window character by character.
+        """
         issues = []
         min_seq = PATTERN_THRESHOLDS["min_sequence_length"]
         
-        # Check for sequences in sliding windows
-        for i in range(len(password) - min_seq + 1):
-            window = password[i:i + min_seq]
-            
-            # Check ascending alphabetical
-            if self._is_ascending_alpha(window):
-                issues.append(f"Sequential pattern: '{window}' (ascending)")
-                continue
-            
-            # Check descending alphabetical
-            if self._is_descending_alpha(window):
-                issues.append(f"Sequential pattern: '{window}' (descending)")
-                continue
-            
-            # Check ascending numerical
-            if self._is_ascending_numeric(window):
-                issues.append(f"Sequential pattern: '{window}' (numerical)")
+        if len(password) < min_seq:
+            return issues
+        
+        if patterns_core is not None:
+            return patterns_core.detect_sequential(password, min_seq)
+        
+        # Per-character (kind, value), or None for characters that can't
+        # be part of a sequence
+        values = []
+        for char in password:
+            if char.isdecimal():
+                values.append(("digit", int(char)))
+            elif char.isalpha():
+                char_lower = char.lower()
+                values.append(("alpha", ord(char_lower)) if len(char_lower) == 1 else None)
+            else:
+                values.append(None)
+        
+        # Step between each adjacent pair: (kind, +1/-1), or None
+        steps = []
+        for prev, cur in zip(values, values[1:]):
+            if prev is None or cur is None or prev[0] != cur[0]:
+                steps.append(None)
                 continue
-            
-            # Check descending numerical
-            if self._is_descending_numeric(window):
-                issues.append(f"Sequential pattern: '{window}' (numerical descending)")
+            diff = cur[1] - prev[1]
+            if prev[0] == "digit":
+                diff = (diff + 1) % 10 - 1  # Handle wrap-around (9->0, 0->9)
+            steps.append((prev[0], diff) if diff in (1, -1) else None)
+        
+        # Every window inside a long enough run of equal steps is sequential
+        run_needed = min_seq - 1
+        pos = 0
+        for step, run in itertools.groupby(steps):
+            run_len = sum(1 for _ in run)
+            if step is not None and run_len >= run_needed:
+                label = _SEQUENCE_LABELS[step]
+                for i in range(pos, pos + run_len - run_needed + 1):
+                    issues.append(f"Sequential pattern: '{password[i:i + min_seq]}' ({label})")
+            pos += run_len
         
         return issues
     
-    def _is_ascending_alpha(self, s: str) -> bool:
-        """Check if string is ascending alphabetical sequence."""
-        if not s.isalpha():
-            return False
-        s_lower = s.lower()
-        for i in range(len(s_lower) - 1):
-            if ord(s_lower[i + 1]) != ord(s_lower[i]) + 1:
-                return False
-        return True
-    
-    def _is_descending_alpha(self, s: str) -> bool:
-        """Check if string is descending alphabetical sequence."""
-        if not s.isalpha():
-            return False
-        s_lower = s.lower()
-        for i in range(len(s_lower) - 1):
-            if ord(s_lower[i + 1]) != ord(s_lower[i]) - 1:
-                return False
-        return True
-    
-    def _is_ascending_numeric(self, s: str) -> bool:
-        """Check if string is ascending numerical sequence."""
-        if not s.isdigit():
-            return False
-        for i in range(len(s) - 1):
-            if int(s[i + 1]) != (int(s[i]) + 1) % 10:  # Handle wrap-around (9->0)
-                return False
-        return True
-    
-    def _is_descending_numeric(self, s: str) -> bool:
-        """Check if string is descending numerical sequence."""
-        if not s.isdigit():
-            return False
-        for i in range(len(s) - 1):
-            if int(s[i + 1]) != (int(s[i]) - 1) % 10:  # Handle wrap-around (0->9)
-                return False
-        return True
-    
     def _detect_keyboard_patterns(self, password_lower: str) -> List[str]:
         """Detect keyboard layout patterns."""
-        issues = []
-        min_len = PATTERN_THRESHOLDS["min_keyboard_pattern_length"]
-        
-        for i in range(len(password_lower) - min_len + 1):
-            window = password_lower[i:i + min_len]
-            if window in self.keyboard_patterns:
-                issues.append(f"Keyboard pattern detected: '{window}'")
-        
-        return issues
+        return [
+            f"Keyboard pattern detected: '{match.group(1)}'"
+            for match in self._keyboard_re.finditer(password_lower)
+        ]
     
     def _detect_leetspeak(self, password_lower: str) -> List[str]:
         """Detect leetspeak substitutions."""
         issues = []
         
         # Check for common leetspeak patterns
-        leet_patterns = [
-            (r'[a@]dm[i1]n', 'admin'),
-            (r'p[@a]ssw[o0]rd', 'password'),
-            (r'[l1]0v3', 'love'),
-            (r'[h4]ack', 'hack'),
-            (r'[t7]est', 'test'),
-        ]
-        
-        for pattern, word in leet_patterns:
-            if re.search(pattern, password_lower):
+        found = {match.lastgroup for match in _LEET_RE.finditer(password_lower)}
+        for name, _, word in _LEET_PATTERNS:
+            if name in found:
                 issues.append(f"Leetspeak substitution detected (resembles '{word}')")
         
         # General leetspeak detection: check if password has high ratio of digit/special
         # substitutions that match common leetspeak patterns
-        leet_count = 0
-        for char in password_lower:
-            for original, substitutions in self.LEETSPEAK_MAP.items():
-                if char in substitutions:
-                    leet_count += 1
-                    break
+        if patterns_core is not None:
+            leet_count = patterns_core.count_leet(password_lower, self._LEET_CHARS)
+        else:
+            leet_count = sum(map(self._LEET_CHARS.__contains__, password_lower))
         
         if len(password_lower) > 0 and leet_count / len(password_lower) > 0.3:
             issues.append("High leetspeak substitution ratio detected")
@@ -272,51 +423,111 @@ class PatternDetector:
         if not self.dictionary_words:
             return issues
         
-        min_word_len = PATTERN_THRESHOLDS["min_dictionary_word_length"]
+        password_bytes = _encode(password_lower)
         
         # Check if entire password is a dictionary word
-        if len(password_lower) >= min_word_len and password_lower in self.dictionary_words:
+        if self._dict_contains(password_bytes):
             issues.append(f"Password is a common dictionary word: '{password_lower}'")
         
-        # Check for dictionary words as substrings
-        for word in self.dictionary_words:
-            if len(word) >= min_word_len and word in password_lower:
-                # Avoid duplicate issues
-                if word not in [issue.split("'")[1] for issue in issues if "'" in issue]:
+        # Check for dictionary words as substrings in a single automaton pass
+        if self._dict_automaton is not None:
+            found = {}
+            for _, word in self._dict_automaton.iter(password_lower):
+                found[word] = None
+            for word in found:
+                # Avoid duplicating the whole-password issue
+                if word != password_lower:
                     issues.append(f"Contains dictionary word: '{word}'")
+            return issues
+        
+        # Fallback: look up every substring with a dictionary word length,
+        # instead of searching the password once per dictionary word.
+        # A byte window that splits a UTF-8 character is never a valid word,
+        # so byte windows match exactly the character substrings, and windows
+        # starting on a continuation byte are skipped without being sliced.
+        password_len = len(password_bytes)
+        found = {}
+        for start in range(password_len):
+            if 0x80 <= password_bytes[start] < 0xC0:
+                continue
+            for length in self._dict_word_lengths:
+                end = start + length
+                if end > password_len:
+                    break
+                word_bytes = password_bytes[start:end]
+                # Avoid duplicating the whole-password issue
+                if word_bytes != password_bytes and self._dict_contains(word_bytes):
+                    found[word_bytes] = None
+        for word_bytes in found:
+            word = word_bytes.decode('utf-8', errors='surrogatepass')
+            issues.append(f"Contains dictionary word: '{word}'")
         
         return issues
     
     def _detect_year_patterns(self, password: str) -> List[str]:
-        """Detect year patterns (1900-2099)."""
+        """
+        Detect year patterns (1900-2099).
+        
+        Scans each maximal run of digits once and checks its 4-digit windows.
+        A year found is skipped over, so its digits aren't reused by an
+        overlapping window, but a non-year window only advances by one digit
+        (so '12020' yields '2020').
+        
+        The scan works on bytes, computing each window's value arithmetically
+        from the digit bytes instead of slicing and parsing it.
+        """
         issues = []
         min_year, max_year = PATTERN_THRESHOLDS["max_year_range"]
         
-        # Match 4-digit years
-        year_pattern = r'\d{4}'
-        matches = re.finditer(year_pattern, password)
+        if password.isascii():
+            digits = password.encode('ascii')
+        else:
+            # Map other decimal digits (e.g. Arabic-Indic) to ASCII digits,
+            # one character per byte so positions still match the password
+            digits = ''.join(
+                str(int(char)) if char.isdecimal() else ' ' for char in password
+            ).encode('ascii')
         
-        for match in matches:
-            year_str = match.group()
-            try:
-                year = int(year_str)
-                if min_year <= year <= max_year:
-                    issues.append(f"Year pattern detected: '{year_str}'")
-            except ValueError:
+        i = 0
+        n = len(digits)
+        while i <= n - 4:
+            if not 48 <= digits[i] <= 57:
+                i += 1
                 continue
+            
+            # Find the end of this run of digits
+            run_end = i + 1
+            while run_end < n and 48 <= digits[run_end] <= 57:
+                run_end += 1
+            
+            # Check every 4-digit window in the run
+            while i <= run_end - 4:
+                year = ((digits[i] - 48) * 1000 + (digits[i + 1] - 48) * 100
+                        + (digits[i + 2] - 48) * 10 + (digits[i + 3] - 48))
+                if min_year <= year <= max_year:
+                    issues.append(f"Year pattern detected: '{password[i:i + 4]}'")
+                    i += 4
+                else:
+                    i += 1
+            i = run_end
         
         return issues
     
-    def _detect_username_similarity(self, password: str, username: Optional[str], 
+    def _detect_username_similarity(self, password_lower: str, username: Optional[str], 
                                    email: Optional[str]) -> List[str]:
-        """Detect similarity to username or email."""
+        """
+        Detect similarity to username or email.
+        
+        Args:
+            password_lower: Lowercased password, as computed once by detect_all
+            username: Optional username
+            email: Optional email address
+        """
         issues = []
         
         if not username and not email:
             return issues
         
-        password_lower = password.lower()
-        
         # Check username similarity
         if username:
             username_lower = username.lower()
@@ -326,41 +537,45 @@ class PatternDetector:
                 issues.append(f"Password contains username: '{username}'")
             
             # Check similarity ratio
-            similarity = SequenceMatcher(None, password_lower, username_lower).ratio()
+            similarity = _similarity_ratio(password_lower, username_lower)
             if similarity >= SIMILARITY_THRESHOLD:
                 issues.append(f"Password too similar to username (similarity: {similarity:.2f})")
         
         # Check email similarity
         if email:
-            email_lower = email.lower()
-            # Extract local part (before @)
-            email_local = email_lower.split('@')[0] if '@' in email_lower else email_lower
+            # Extract local part (before @), lowercasing only that part
+            email_local = email.partition('@')[0].lower()
             
             # Check if email local part is substring of password
             if email_local in password_lower:
                 issues.append(f"Password contains email username: '{email_local}'")
             
             # Check similarity ratio
-            similarity = SequenceMatcher(None, password_lower, email_local).ratio()
+            similarity = _similarity_ratio(password_lower, email_local)
             if similarity >= SIMILARITY_THRESHOLD:
                 issues.append(f"Password too similar to email (similarity: {similarity:.2f})")
         
         return issues
     
-    def _detect_low_variety(self, password: str) -> List[str]:
-        """Detect low character variety (too many repeated unique characters)."""
+    def _detect_low_variety(self, unique_chars: Set[str], password_length: int) -> List[str]:
+        """
+        Detect low character variety (too many repeated unique characters).
+        
+        Args:
+            unique_chars: Set of distinct characters in the password
+            password_length: Length of the password
+        """
         issues = []
         
-        if len(password) == 0:
+        if password_length == 0:
             return issues
         
-        unique_chars = len(set(password))
-        variety_ratio = unique_chars / len(password)
+        variety_ratio = len(unique_chars) / password_length
         
         if variety_ratio < MIN_CHAR_VARIETY_RATIO:
             issues.append(
-                f"Low character variety: {unique_chars} unique characters "
-                f"out of {len(password)} (ratio: {variety_ratio:.2f})"
+                f"Low character variety: {len(unique_chars)} unique characters "
+                f"out of {password_length} (ratio: {variety_ratio:.2f})"
             )
         
         return issues
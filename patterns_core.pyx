@@ -0,0 +1,137 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled character-level loops for pattern detection.
+
+Optional Cython versions of the per-character detectors in patterns.py. They
+produce exactly the same issues as the pure-Python code, which is used when
+this module isn't built. Build in place with:
+
+    pip install cython
+    cythonize -i patterns_core.pyx
+
+Performance rationale: The repeated-character, sequential-character and
+leetspeak-count detectors are loops over every character of the password,
+where CPython's bytecode dispatch dominates. Typed Py_UCS4 loops remove it.
+"""
+
+from cpython.unicode cimport (
+    Py_UNICODE_ISALPHA,
+    Py_UNICODE_ISDECIMAL,
+    Py_UNICODE_TODECIMAL,
+)
+
+cdef enum:
+    KIND_NONE = 0
+    KIND_ALPHA = 1
+    KIND_DIGIT = 2
+    # Step codes for sequential detection; index into _SEQUENCE_LABELS
+    STEP_NONE = 0
+
+_SEQUENCE_LABELS = (None, "ascending", "descending", "numerical", "numerical descending")
+
+
+cdef inline int _classify(Py_UCS4 c, long *value):
+    """Return the sequence kind of a character and store its comparison value."""
+    # ASCII fast path: plain range checks instead of Unicode database lookups
+    if c < 128:
+        if u'0' <= c <= u'9':
+            value[0] = <long>c - 48
+            return KIND_DIGIT
+        if u'a' <= c <= u'z':
+            value[0] = <long>c
+            return KIND_ALPHA
+        if u'A' <= c <= u'Z':
+            value[0] = <long>c + 32
+            return KIND_ALPHA
+        return KIND_NONE
+
+    if Py_UNICODE_ISDECIMAL(c):
+        value[0] = Py_UNICODE_TODECIMAL(c)
+        return KIND_DIGIT
+    if not Py_UNICODE_ISALPHA(c):
+        return KIND_NONE
+    # Full Unicode lowercasing, which may map to several characters
+    lower = str(c).lower()
+    if len(lower) != 1:
+        return KIND_NONE
+    value[0] = ord(lower)
+    return KIND_ALPHA
+
+
+cpdef list detect_repeated(str password, int min_repeat):
+    """Repeated-character issues, as PatternDetector._detect_repeated_chars."""
+    cdef Py_ssize_t n = len(password), i = 0, j
+    cdef Py_UCS4 c
+    cdef list issues = []
+
+    while i < n:
+        c = password[i]
+        j = i + 1
+        while j < n and password[j] == c:
+            j += 1
+        if j - i >= min_repeat:
+            issues.append(f"Repeated character '{str(c)}' {j - i} times")
+        i = j
+
+    return issues
+
+
+cdef void _emit_sequences(list issues, str password, int step, Py_ssize_t run_start,
+                          Py_ssize_t run_len, int min_seq):
+    """Append an issue for every min_seq window inside a run of equal steps."""
+    cdef Py_ssize_t start
+    if step == STEP_NONE or run_len < min_seq - 1:
+        return
+    label = _SEQUENCE_LABELS[step]
+    for start in range(run_start, run_start + run_len - (min_seq - 1) + 1):
+        issues.append(f"Sequential pattern: '{password[start:start + min_seq]}' ({label})")
+
+
+cpdef list detect_sequential(str password, int min_seq):
+    """Sequential-character issues, as PatternDetector._detect_sequential_chars."""
+    cdef Py_ssize_t n = len(password), i, run_start = 0, run_len = 0
+    cdef int prev_kind, cur_kind, step, run_step = STEP_NONE
+    cdef long prev_value = 0, cur_value = 0, diff
+    cdef list issues = []
+
+    if n < min_seq:
+        return issues
+
+    prev_kind = _classify(password[0], &prev_value)
+    for i in range(1, n):
+        cur_kind = _classify(password[i], &cur_value)
+
+        # Step between characters i-1 and i
+        step = STEP_NONE
+        if cur_kind != KIND_NONE and cur_kind == prev_kind:
+            diff = cur_value - prev_value
+            if cur_kind == KIND_DIGIT:
+                diff = (diff + 11) % 10 - 1  # Handle wrap-around (9->0, 0->9)
+            if diff == 1:
+                step = 1 if cur_kind == KIND_ALPHA else 3
+            elif diff == -1:
+                step = 2 if cur_kind == KIND_ALPHA else 4
+
+        if step == run_step:
+            run_len += 1
+        else:
+            _emit_sequences(issues, password, run_step, run_start, run_len, min_seq)
+            run_step = step
+            run_start = i - 1
+            run_len = 1
+
+        prev_kind = cur_kind
+        prev_value = cur_value
+
+    _emit_sequences(issues, password, run_step, run_start, run_len, min_seq)
+    return issues
+
+
+cpdef Py_ssize_t count_leet(str password_lower, frozenset leet_chars):
+    """Number of characters of password_lower that are in leet_chars."""
+    cdef Py_ssize_t count = 0
+    cdef Py_UCS4 c
+    for c in password_lower:
+        if str(c) in leet_chars:
+            count += 1
+    return count
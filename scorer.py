@@ -11,6 +11,7 @@ preserving explainability. The score balances multiple factors:
 - Breach status (forces weak classification if compromised)
 """
 
+from bisect import bisect_right
 from typing import Dict, List
 
 from config import (
@@ -19,6 +20,33 @@ from config import (
     MIN_ENTROPY_BITS,
 )
 
+# Piecewise-linear entropy-to-score mapping (0-80 points). Each 20-bit band
+# is (band start in bits, score at band start, points gained over the band).
+# Good entropy is 40+ bits, excellent is 60+ bits.
+_ENTROPY_BAND_WIDTH = 20
+_ENTROPY_BANDS = (
+    (0, 0, 20),  # 0-20 points
+    (20, 20, 30),  # 20-50 points
+    (40, 50, 20),  # 50-70 points
+    (60, 70, 10),  # 70-80 points
+)
+_ENTROPY_BAND_STARTS = tuple(start for start, _, _ in _ENTROPY_BANDS[1:])
+
+# Length bonus indexed by min(length, 16): +1 from 8, +3 from 12, +5 from 16
+_LENGTH_BONUS = (0,) * 8 + (1,) * 4 + (3,) * 4 + (5,)
+
+# (pattern type, penalty) pairs, so scoring doesn't look each type up
+_PENALTIES_ITEMS = tuple(PATTERN_PENALTIES.items())
+
+# Strength classification: a score at or above each bound moves up one
+# label, so a binary search over the bounds picks the label
+_STRENGTH_BOUNDS = (
+    SCORE_THRESHOLDS["WEAK"],
+    SCORE_THRESHOLDS["MEDIUM"],
+    SCORE_THRESHOLDS["STRONG"],
+)
+_STRENGTH_LABELS = ("Weak", "Medium", "Strong", "Very Strong")
+
 
 class PasswordScorer:
     """Scores passwords based on entropy, patterns, and breach status."""
@@ -52,36 +80,27 @@ class PasswordScorer:
         if is_breached:
             return 0
         
-        # Base score from entropy (0-80 points)
-        # Normalize entropy to 0-80 scale
-        # Good entropy is 40+ bits, excellent is 60+ bits
+        # Base score from entropy (0-80 points), interpolated within the
+        # entropy band found by binary search
         if entropy_bits <= 0:
             base_score = 0
-        elif entropy_bits < 20:
-            base_score = int((entropy_bits / 20) * 20)  # 0-20 points
-        elif entropy_bits < 40:
-            base_score = int(20 + ((entropy_bits - 20) / 20) * 30)  # 20-50 points
-        elif entropy_bits < 60:
-            base_score = int(50 + ((entropy_bits - 40) / 20) * 20)  # 50-70 points
         else:
-            base_score = int(70 + min((entropy_bits - 60) / 20 * 10, 10))  # 70-80 points
+            band_start, band_score, band_points = _ENTROPY_BANDS[
+                bisect_right(_ENTROPY_BAND_STARTS, entropy_bits)
+            ]
+            base_score = int(band_score + min(
+                (entropy_bits - band_start) / _ENTROPY_BAND_WIDTH * band_points, band_points
+            ))
         
         score = base_score
         
-        # Apply pattern penalties
-        for pattern_type, issues in pattern_issues.items():
-            if issues:  # If any issues of this type detected
-                penalty = PATTERN_PENALTIES.get(pattern_type, 0)
-                # Apply penalty once per pattern type (not per issue)
-                score -= penalty
+        # Apply pattern penalties, once per pattern type with any issues
+        # (not per issue)
+        score -= sum(penalty for pattern_type, penalty in _PENALTIES_ITEMS
+                     if pattern_issues.get(pattern_type))
         
         # Length bonus (small bonus for longer passwords, max +5 points)
-        if length >= 16:
-            score += 5
-        elif length >= 12:
-            score += 3
-        elif length >= 8:
-            score += 1
+        score += _LENGTH_BONUS[min(max(length, 0), 16)]
         
         # Ensure score is in valid range
         score = max(0, min(100, score))
@@ -99,14 +118,7 @@ class PasswordScorer:
         Returns:
             Strength classification: "Weak", "Medium", "Strong", or "Very Strong"
         """
-        if score < SCORE_THRESHOLDS["WEAK"]:
-            return "Weak"
-        elif score < SCORE_THRESHOLDS["MEDIUM"]:
-            return "Medium"
-        elif score < SCORE_THRESHOLDS["STRONG"]:
-            return "Strong"
-        else:
-            return "Very Strong"
+        return _STRENGTH_LABELS[bisect_right(_STRENGTH_BOUNDS, score)]
     
     @staticmethod
     def generate_recommendations(
@@ -1,129 +1,280 @@
 """
 Setup script to download and prepare data files for password evaluation.
 
-Downloads common wordlists and password blacklists from public sources.
+The data files ship with the repository; this script only generates the ones
+that are missing, or regenerates ones it wrote itself that have gone stale.
+With --wordlist-url / --blacklist-url it downloads the data files from public
+sources instead, concurrently.
 """
 
+import argparse
+import hashlib
 import os
-import urllib.request
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from config import DATA_DIR, WORDLIST_FILE, BLACKLIST_FILE
+from wordlist import LOWERCASE_HEADER
 
+# Read/write buffer for downloads; large wordlists would otherwise be copied
+# in small chunks
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 
-def download_file(url: str, filepath: str):
-    """Download a file from URL to filepath."""
+# Seconds a download may wait on the server (to connect, or between reads)
+# before failing, so a stalled server can't hang a download worker forever
+DOWNLOAD_TIMEOUT = 30
+
+# Common English words of 4+ letters for the dictionary wordlist. Kept
+# lowercase, deduplicated and sorted in the source, so writing the file needs
+# no set/sort pass
+_COMMON_WORDS = (
+    "about", "accept", "access", "account", "active", "admin",
+    "administrator", "after", "again", "allow", "also", "always",
+    "amazing", "ancient", "another", "application", "approve", "attempt",
+    "available", "average", "awesome", "awful", "back", "backup",
+    "because", "been", "before", "begin", "beginning", "being", "best",
+    "better", "both", "bottom", "cancel", "cannot", "center", "change",
+    "check", "clear", "close", "come", "common", "commonly", "complete",
+    "computer", "conditions", "config", "configuration", "confirm",
+    "constantly", "contact", "continue", "continuously", "copyright",
+    "could", "create", "current", "custom", "data", "database", "default",
+    "delete", "deny", "different", "disable", "disabled", "disapprove",
+    "display", "does", "doing", "done", "down", "during", "each",
+    "earliest", "early", "edit", "either", "email", "empty", "enable",
+    "enabled", "equal", "error", "eternal", "even", "every", "excellent",
+    "exit", "failed", "fair", "false", "fantastic", "fast", "field",
+    "finish", "first", "following", "forbid", "forever", "form",
+    "forward", "frequently", "from", "full", "general", "generally",
+    "generic", "give", "good", "goodbye", "gradual", "great", "greater",
+    "guest", "hardware", "have", "having", "hello", "help", "here",
+    "hidden", "hide", "home", "horrible", "ideal", "identical",
+    "immediate", "inactive", "information", "install", "instant",
+    "internet", "into", "invalid", "irregularly", "just", "know", "last",
+    "late", "later", "latest", "least", "left", "legal", "less",
+    "letmein", "license", "like", "loading", "login", "look", "love",
+    "make", "many", "master", "middle", "might", "modern", "modify",
+    "momentary", "money", "monitor", "more", "most", "multiple", "must",
+    "neither", "network", "never", "next", "nice", "none", "normal",
+    "normally", "notice", "null", "observe", "occasionally", "often",
+    "okay", "once", "online", "only", "open", "optional", "options",
+    "original", "other", "ought", "over", "page", "pagedown", "pageup",
+    "particular", "password", "pause", "people", "perfect",
+    "periodically", "permanent", "permit", "please", "policy", "poor",
+    "preceding", "preferences", "previous", "prior", "privacy", "private",
+    "processing", "public", "quick", "quit", "qwerty", "rapid", "rare",
+    "rarely", "ready", "recent", "regularly", "reject", "remove",
+    "repeat", "required", "reset", "restore", "resume", "retry", "right",
+    "root", "same", "save", "secret", "security", "seldom", "server",
+    "service", "settings", "shall", "should", "show", "similar", "slow",
+    "software", "some", "sometimes", "soon", "special", "specific",
+    "standard", "start", "stop", "submit", "success", "sudden", "support",
+    "system", "take", "temp", "temporary", "terms", "terrible", "test",
+    "than", "thank", "thanks", "that", "their", "them", "then", "there",
+    "these", "they", "think", "this", "those", "time", "today",
+    "tomorrow", "true", "twice", "typical", "typically", "unavailable",
+    "uncommon", "unequal", "uninstall", "unique", "update", "user",
+    "username", "usual", "usually", "valid", "validate", "verify",
+    "version", "view", "visible", "wait", "want", "warning", "watch",
+    "website", "welcome", "well", "were", "what", "when", "where",
+    "which", "while", "whom", "whose", "will", "with", "wonderful",
+    "work", "worse", "worst", "would", "year", "yesterday", "your",
+)
+
+
+def _new_session(max_workers: int):
+    """
+    Create a keep-alive HTTP session for downloads.
+    
+    Returns:
+        requests.Session, or None if the 'requests' library is not installed
+        (downloads then fall back to urllib, one connection per file)
+    """
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+    except ImportError:
+        return None
+    
+    session = requests.Session()
+    # One pooled connection per concurrent download
+    adapter = HTTPAdapter(pool_maxsize=max_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _fetch(url: str, headers: Dict[str, str], f, session=None) -> bool:
+    """
+    Copy the body of a URL into an open binary file.
+    
+    Returns:
+        False if the server answered 304 Not Modified (nothing written)
+    """
+    if session is not None:
+        with session.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            if response.status_code == 304:
+                return False
+            response.raise_for_status()
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+        return True
+    
+    # Imported here so runs that download nothing don't pay for them
+    import shutil
+    import urllib.error
+    import urllib.request
+    
+    try:
+        request = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+            shutil.copyfileobj(response, f, length=DOWNLOAD_CHUNK_SIZE)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return False
+        raise
+    return True
+
+
+def download_file(url: str, filepath: str, session=None):
+    """
+    Download a file from URL to filepath.
+    
+    If filepath already exists, the request carries an If-Modified-Since header
+    with its modification time, and a 304 reply leaves the file untouched
+    instead of transferring it again.
+    
+    Args:
+        url: URL to download
+        filepath: Destination path
+        session: Optional requests.Session to reuse connections across downloads
+    """
     print(f"Downloading {url}...")
+    headers = {}
+    if os.path.exists(filepath):
+        headers["If-Modified-Since"] = formatdate(os.path.getmtime(filepath), usegmt=True)
+    
+    tmp_path = None
     try:
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        urllib.request.urlretrieve(url, filepath)
+        directory = os.path.dirname(filepath) or "."
+        os.makedirs(directory, exist_ok=True)
+        # Download to a uniquely named temporary file, so a failed transfer
+        # never replaces a good copy and concurrent downloads to the same
+        # destination don't write into each other's file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(filepath) + ".",
+                                        suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            modified = _fetch(url, headers, f, session)
+        if not modified:
+            os.remove(tmp_path)
+            print(f"✓ {filepath} is up to date")
+            return
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filepath)
+        # The file is no longer this script's generated output, so drop any
+        # digest sidecar that would get it regenerated over the download
+        digest_path = _digest_path(Path(filepath))
+        if digest_path.exists():
+            os.remove(digest_path)
         print(f"✓ Downloaded to {filepath}")
     except Exception as e:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
         print(f"✗ Failed to download {url}: {e}")
 
 
+def download_files(downloads: Iterable[Tuple[str, str]], max_workers: int = 8):
+    """
+    Download several files concurrently.
+    
+    Downloads are network-bound, so running them on a thread pool overlaps
+    their latency instead of paying it once per file. With 'requests'
+    installed, they share one keep-alive session, so files from the same
+    host reuse connections.
+    
+    Args:
+        downloads: (url, filepath) pairs
+        max_workers: Maximum number of concurrent downloads
+    """
+    session = _new_session(max_workers)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(lambda download: download_file(*download, session=session), downloads))
+    finally:
+        if session is not None:
+            session.close()
+
+
+def _digest_path(path: Path) -> Path:
+    """Return the path of the SHA-256 sidecar recording how a file was generated."""
+    return path.with_suffix(".sha256")
+
+
+def _needs_update(path: Path, payload: bytes) -> bool:
+    """
+    Check whether a data file should be (re)generated from this payload.
+    
+    Missing files are generated. An existing file is only regenerated if this
+    script wrote it (it has a SHA-256 sidecar) and it no longer matches: its
+    size or recorded digest differs from the payload. Files without a sidecar,
+    such as the shipped data files or a user-supplied blacklist, are never
+    overwritten.
+    """
+    if not path.exists():
+        return True
+    try:
+        recorded = _digest_path(path).read_text().strip()
+    except OSError:
+        return False
+    return path.stat().st_size != len(payload) or recorded != hashlib.sha256(payload).hexdigest()
+
+
+def _write_generated(path: Path, payload: bytes):
+    """Write a generated file and then its SHA-256 sidecar."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Written to a temporary file and renamed into place, so an interrupted
+    # run never leaves a truncated data file behind
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        try:
+            # Unbuffered: the payload is already one buffer, so hand it
+            # straight to os.write (normally a single syscall) instead of
+            # copying it through a file object's buffer
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    _digest_path(path).write_text(hashlib.sha256(payload).hexdigest() + "\n")
+
+
 def create_common_words():
-    """Create a common words file if it doesn't exist."""
+    """Create the common words file if it is missing or generated and stale."""
     wordlist_path = Path(WORDLIST_FILE)
-    if wordlist_path.exists():
+    
+    # Entries are all lowercase; let loaders skip lowercasing
+    payload = ('\n'.join([LOWERCASE_HEADER, *_COMMON_WORDS]) + '\n').encode('utf-8')
+    if not _needs_update(wordlist_path, payload):
         print(f"✓ Wordlist already exists at {wordlist_path}")
         return
     
-    # Common English words (top 1000)
-    common_words = [
-        "password", "admin", "test", "user", "login", "welcome", "qwerty",
-        "letmein", "master", "hello", "love", "money", "secret", "access",
-        "computer", "internet", "system", "service", "account", "email",
-        "website", "online", "network", "security", "information", "data",
-        "database", "server", "application", "software", "hardware",
-        "password", "username", "administrator", "root", "guest", "public",
-        "private", "default", "change", "new", "old", "temp", "temporary",
-        "backup", "restore", "update", "install", "uninstall", "config",
-        "configuration", "settings", "options", "preferences", "help",
-        "support", "contact", "about", "version", "license", "copyright",
-        "terms", "conditions", "privacy", "policy", "legal", "notice",
-        "warning", "error", "success", "failed", "invalid", "valid",
-        "required", "optional", "field", "form", "submit", "cancel",
-        "reset", "clear", "save", "delete", "remove", "add", "edit",
-        "modify", "create", "new", "open", "close", "exit", "quit",
-        "start", "stop", "pause", "resume", "continue", "next", "previous",
-        "first", "last", "back", "forward", "home", "end", "page", "pageup",
-        "pagedown", "up", "down", "left", "right", "top", "bottom",
-        "center", "middle", "begin", "beginning", "finish", "complete",
-        "done", "ready", "wait", "loading", "processing", "please",
-        "thank", "thanks", "welcome", "hello", "hi", "goodbye", "bye",
-        "yes", "no", "ok", "okay", "confirm", "deny", "accept", "reject",
-        "approve", "disapprove", "allow", "deny", "permit", "forbid",
-        "enable", "disable", "on", "off", "true", "false", "null",
-        "empty", "full", "available", "unavailable", "active", "inactive",
-        "enabled", "disabled", "visible", "hidden", "show", "hide",
-        "display", "view", "see", "look", "watch", "observe", "monitor",
-        "check", "verify", "validate", "confirm", "test", "try", "attempt",
-        "retry", "repeat", "again", "once", "twice", "multiple", "many",
-        "few", "some", "all", "none", "any", "each", "every", "both",
-        "either", "neither", "other", "another", "same", "different",
-        "similar", "identical", "equal", "unequal", "greater", "less",
-        "more", "most", "least", "best", "worst", "better", "worse",
-        "good", "bad", "nice", "great", "excellent", "perfect", "ideal",
-        "wonderful", "fantastic", "amazing", "awesome", "terrible",
-        "horrible", "awful", "poor", "fair", "average", "normal", "usual",
-        "common", "uncommon", "rare", "unique", "special", "particular",
-        "specific", "general", "generic", "typical", "standard", "custom",
-        "default", "original", "new", "old", "ancient", "modern", "current",
-        "recent", "latest", "earliest", "first", "last", "next", "previous",
-        "prior", "following", "preceding", "before", "after", "during",
-        "while", "when", "where", "why", "how", "what", "which", "who",
-        "whom", "whose", "this", "that", "these", "those", "here", "there",
-        "now", "then", "today", "tomorrow", "yesterday", "soon", "later",
-        "early", "late", "quick", "slow", "fast", "rapid", "gradual",
-        "sudden", "immediate", "instant", "momentary", "temporary",
-        "permanent", "eternal", "forever", "always", "never", "sometimes",
-        "often", "rarely", "seldom", "usually", "normally", "typically",
-        "generally", "commonly", "frequently", "occasionally", "periodically",
-        "regularly", "irregularly", "constantly", "continuously", "constantly",
-        "continuously", "constantly", "continuously", "constantly",
-        "continuously", "constantly", "continuously", "constantly",
-        "continuously", "constantly", "continuously", "constantly",
-    ]
-    
-    # Add more common words
-    common_words.extend([
-        "the", "be", "to", "of", "and", "a", "in", "that", "have", "i",
-        "it", "for", "not", "on", "with", "he", "as", "you", "do", "at",
-        "this", "but", "his", "by", "from", "they", "we", "say", "her",
-        "she", "or", "an", "will", "my", "one", "all", "would", "there",
-        "their", "what", "so", "up", "out", "if", "about", "who", "get",
-        "which", "go", "me", "when", "make", "can", "like", "time", "no",
-        "just", "him", "know", "take", "people", "into", "year", "your",
-        "good", "some", "could", "them", "see", "other", "than", "then",
-        "now", "look", "only", "come", "its", "over", "think", "also",
-        "back", "after", "use", "two", "how", "our", "work", "first",
-        "well", "way", "even", "new", "want", "because", "any", "these",
-        "give", "day", "most", "us", "is", "are", "was", "were", "been",
-        "being", "have", "has", "had", "having", "do", "does", "did",
-        "doing", "will", "would", "should", "could", "may", "might", "must",
-        "can", "cannot", "ought", "shall", "should", "will", "would",
-    ])
-    
-    # Remove duplicates and sort
-    common_words = sorted(set(word.lower() for word in common_words if len(word) >= 4))
-    
     try:
-        os.makedirs(os.path.dirname(wordlist_path), exist_ok=True)
-        with open(wordlist_path, 'w', encoding='utf-8') as f:
-            for word in common_words:
-                f.write(word + '\n')
-        print(f"✓ Created wordlist with {len(common_words)} words at {wordlist_path}")
+        _write_generated(wordlist_path, payload)
+        print(f"✓ Created wordlist with {len(_COMMON_WORDS)} words at {wordlist_path}")
     except Exception as e:
         print(f"✗ Failed to create wordlist: {e}")
 
 
 def create_blacklist():
-    """Create a password blacklist if it doesn't exist."""
+    """Create the password blacklist if it is missing or generated and stale."""
     blacklist_path = Path(BLACKLIST_FILE)
-    if blacklist_path.exists():
-        print(f"✓ Blacklist already exists at {blacklist_path}")
-        return
     
     # Top 100 most common passwords (RockYou leak + common patterns)
     top_passwords = [
@@ -156,31 +307,69 @@ def create_blacklist():
     ]
     
     # Add common patterns
-    for num in range(100):
-        top_passwords.append(f"password{num}")
-        top_passwords.append(f"pass{num}")
-        top_passwords.append(f"admin{num}")
-        top_passwords.append(f"user{num}")
-        top_passwords.append(f"test{num}")
+    top_passwords.extend(
+        f"{prefix}{num}"
+        for prefix in ("password", "pass", "admin", "user", "test")
+        for num in range(100)
+    )
+    
+    # Remove duplicates; sorted so the generated file is deterministic
+    top_passwords = sorted({*top_passwords})
     
-    # Remove duplicates
-    top_passwords = list(set(top_passwords))
+    # Entries are lowercased here; let loaders skip lowercasing
+    payload = ('\n'.join([LOWERCASE_HEADER, *(pwd.lower() for pwd in top_passwords)]) + '\n').encode('utf-8')
+    if not _needs_update(blacklist_path, payload):
+        print(f"✓ Blacklist already exists at {blacklist_path}")
+        return
     
     try:
-        os.makedirs(os.path.dirname(blacklist_path), exist_ok=True)
-        with open(blacklist_path, 'w', encoding='utf-8') as f:
-            for pwd in top_passwords:
-                f.write(pwd.lower() + '\n')
+        _write_generated(blacklist_path, payload)
         print(f"✓ Created blacklist with {len(top_passwords)} passwords at {blacklist_path}")
     except Exception as e:
         print(f"✗ Failed to create blacklist: {e}")
 
 
-def main():
-    """Main setup function."""
+def main(argv: Optional[List[str]] = None):
+    """
+    Main setup function.
+    
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
+    parser = argparse.ArgumentParser(
+        description="Set up the data files for password evaluation"
+    )
+    parser.add_argument(
+        "--wordlist-url",
+        help="Download the dictionary wordlist from this URL instead of generating it"
+    )
+    parser.add_argument(
+        "--blacklist-url",
+        help="Download the breach blacklist from this URL instead of generating it"
+    )
+    args = parser.parse_args(argv)
+    
     print("Setting up password evaluation data files...")
     print()
     
+    # An existing file is only re-downloaded if the server reports it changed
+    # since the local copy was written
+    downloads = [
+        (url, filepath)
+        for url, filepath in ((args.wordlist_url, WORDLIST_FILE), (args.blacklist_url, BLACKLIST_FILE))
+        if url
+    ]
+    if downloads:
+        download_files(downloads)
+    
+    # The data files ship with the repository, so usually there is nothing to
+    # do; files without a digest sidecar weren't written by this script and
+    # are never overwritten
+    data_paths = (Path(WORDLIST_FILE), Path(BLACKLIST_FILE))
+    if all(path.exists() and not _digest_path(path).exists() for path in data_paths):
+        print(f"✓ Data files already exist in {DATA_DIR}")
+        return
+    
     create_common_words()
     create_blacklist()
     
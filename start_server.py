@@ -2,6 +2,10 @@
 """
 Start the password evaluation web server.
 Run this script to start the server in the foreground.
+
+Serves the app with Waitress, a multithreaded production WSGI server, when it
+is installed, and with Flask's threaded development server otherwise. Set
+FLASK_DEBUG=1 to use Flask's server with its debugger instead.
 """
 
 import sys
@@ -10,7 +14,17 @@ import os
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app import app
+from app import app, DEBUG
+
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
+HOST = '0.0.0.0'
+PORT = 5000
+# Worker threads for Waitress; requests waiting on the HIBP API hold one each
+WAITRESS_THREADS = 8
 
 if __name__ == '__main__':
     print("\n" + "=" * 70)
@@ -22,7 +36,10 @@ if __name__ == '__main__':
     print("=" * 70 + "\n")
     
     try:
-        app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
+        if DEBUG or serve is None:
+            app.run(debug=DEBUG, host=HOST, port=PORT, use_reloader=False, threaded=True)
+        else:
+            serve(app, host=HOST, port=PORT, threads=WAITRESS_THREADS)
     except KeyboardInterrupt:
         print("\n\n✓ Server stopped by user")
         sys.exit(0)
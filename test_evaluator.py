@@ -9,21 +9,30 @@ Tests cover:
 - Integration tests
 """
 
+import contextlib
+import io
+import os
+import tempfile
 import unittest
-from unittest.mock import Mock, patch
 
-from evaluator import PasswordEvaluator
+import breach
+import setup_data
+from bloom import BloomFilter
+from evaluator import PasswordEvaluator, get_evaluator
 from patterns import PatternDetector
 from entropy import EntropyCalculator
 from breach import BreachChecker
+from mph import PerfectHashTable, build_mph
 from scorer import PasswordScorer
+from wordlist import load_wordlist
 
 
 class TestPatternDetector(unittest.TestCase):
     """Test pattern detection functionality."""
     
-    def setUp(self):
-        self.detector = PatternDetector()
+    @classmethod
+    def setUpClass(cls):
+        cls.detector = PatternDetector()
     
     def test_repeated_chars(self):
         """Test detection of repeated characters."""
@@ -46,10 +55,22 @@ class TestPatternDetector(unittest.TestCase):
         issues = detector.detect_all("password123")
         self.assertIn("dictionary_word", issues)
     
+    def test_dictionary_bloom_gate(self):
+        """Test dictionary lookups through the Bloom filter pre-check."""
+        detector = PatternDetector({"password", "admin", "test"})
+        self.assertIsNone(detector._dict_bloom)
+        detector._dict_bloom = BloomFilter.from_items(detector.dictionary_words, 3)
+        self.assertTrue(detector._dict_contains(b"password"))
+        self.assertFalse(detector._dict_contains(b"xk9mp2vl"))
+        issues = detector.detect_all("password")
+        self.assertIn("Password is a common dictionary word: 'password'", issues["dictionary_word"])
+    
     def test_year_pattern(self):
         """Test detection of year patterns."""
         issues = self.detector.detect_all("password2020")
         self.assertIn("year_pattern", issues)
+        issues = self.detector.detect_all("x12020")
+        self.assertEqual(issues["year_pattern"], ["Year pattern detected: '2020'"])
     
     def test_username_similarity(self):
         """Test detection of username similarity."""
@@ -60,6 +81,13 @@ class TestPatternDetector(unittest.TestCase):
         """Test detection of low character variety."""
         issues = self.detector.detect_all("aaaaaaa")
         self.assertIn("low_variety", issues)
+    
+    def test_early_exit(self):
+        """Test that detection stops once the penalty limit is reached."""
+        partial = self.detector.detect_all("aaaaaaaaa1999", early_exit_penalty=1)
+        full = self.detector.detect_all("aaaaaaaaa1999")
+        self.assertEqual(list(full), ["repeated_chars", "year_pattern", "low_variety"])
+        self.assertEqual(partial, {"low_variety": full["low_variety"]})
 
 
 class TestEntropyCalculator(unittest.TestCase):
@@ -90,13 +118,20 @@ class TestEntropyCalculator(unittest.TestCase):
         entropy_no_pattern, _ = EntropyCalculator.calculate_entropy("Random123!@#", False)
         entropy_with_pattern, _ = EntropyCalculator.calculate_entropy("Random123!@#", True)
         self.assertGreater(entropy_no_pattern, entropy_with_pattern)
+    
+    def test_positional_entropy(self):
+        """Test frequency-based entropy calculation."""
+        self.assertEqual(EntropyCalculator.calculate_positional_entropy(""), 0.0)
+        self.assertEqual(EntropyCalculator.calculate_positional_entropy("aaaa"), 0.0)
+        self.assertAlmostEqual(EntropyCalculator.calculate_positional_entropy("abcd"), 8.0)
 
 
 class TestBreachChecker(unittest.TestCase):
     """Test breach detection."""
     
-    def setUp(self):
-        self.checker = BreachChecker()
+    @classmethod
+    def setUpClass(cls):
+        cls.checker = BreachChecker()
     
     def test_empty_blacklist(self):
         """Test with empty blacklist."""
@@ -109,6 +144,275 @@ class TestBreachChecker(unittest.TestCase):
         self.checker.add_to_blacklist("testpassword")
         is_breached, reason = self.checker.check_breach("testpassword")
         self.assertTrue(is_breached)
+    
+    def test_hibp_response_parsing(self):
+        """Test matching a hash suffix in a raw HIBP range response."""
+        class FakeResponse:
+            status_code = 200
+            content = (
+                b"0018A45C4D1DEF81644B54AB7F969B88D65:1\r\n"
+                b"1E4C9B93F3F0682250B6CF8331B7EE68FD8:42\r\n"
+            )
+        
+        class FakeSession:
+            def get(self, url, timeout):
+                return FakeResponse()
+        
+        original_session = breach._SESSION
+        breach._SESSION = FakeSession()
+        try:
+            # SHA-1("password") = 5BAA6 1E4C9B93F3F0682250B6CF8331B7EE68FD8
+            is_breached, reason = self.checker._check_hibp("password")
+            self.assertTrue(is_breached)
+            self.assertIn("42 breaches", reason)
+            
+            is_breached, _ = self.checker._check_hibp("not-in-response")
+            self.assertFalse(is_breached)
+        finally:
+            breach._SESSION = original_session
+    
+    def test_check_breach_batch(self):
+        """Test that batch checks match individual checks."""
+        self.checker.add_to_blacklist("batchpassword")
+        passwords = ["batchpassword", "randompassword123", "BatchPassword"]
+        self.assertEqual(
+            self.checker.check_breach_batch(passwords),
+            [self.checker.check_breach(password) for password in passwords]
+        )
+    
+    def test_hibp_results_cached(self):
+        """Test that repeated HIBP lookups for a password reuse the result."""
+        calls = []
+        
+        class FakeResponse:
+            status_code = 200
+            content = b"1E4C9B93F3F0682250B6CF8331B7EE68FD8:42\r\n"
+        
+        class FakeSession:
+            def get(self, url, timeout):
+                calls.append(url)
+                return FakeResponse()
+        
+        original_session = breach._SESSION
+        breach._SESSION = FakeSession()
+        try:
+            first = self.checker._check_hibp_cached("password")
+            second = self.checker._check_hibp_cached("password")
+            self.assertEqual(first, second)
+            self.assertEqual(len(calls), 1)
+        finally:
+            breach._SESSION = original_session
+    
+    def test_hibp_batch_shares_cache(self):
+        """Test that batch HIBP lookups fill the cache used by single checks."""
+        calls = []
+        
+        class FakeResponse:
+            status_code = 200
+            content = b"1E4C9B93F3F0682250B6CF8331B7EE68FD8:42\r\n"
+        
+        class FakeSession:
+            def get(self, url, timeout):
+                calls.append(url)
+                return FakeResponse()
+        
+        checker = BreachChecker()
+        original_session = breach._SESSION
+        original_enabled = breach.BREACH_CONFIG["hibp_enabled"]
+        breach._SESSION = FakeSession()
+        breach.BREACH_CONFIG["hibp_enabled"] = True
+        try:
+            passwords = ["Unlisted#Pass42", "Another#Pass17"]
+            batch = checker.check_breach_batch(passwords)
+            self.assertEqual(len(calls), 2)
+            self.assertEqual(batch, [checker.check_breach(password) for password in passwords])
+            self.assertEqual(len(calls), 2)
+        finally:
+            breach._SESSION = original_session
+            breach.BREACH_CONFIG["hibp_enabled"] = original_enabled
+    
+    def test_hibp_lone_surrogate(self):
+        """Test that an unhashable password fails the HIBP check open."""
+        is_breached, reason = self.checker._check_hibp_cached("ab\ud800cd")
+        self.assertFalse(is_breached)
+        self.assertTrue(reason.startswith("HIBP check failed"))
+
+
+class TestWordlist(unittest.TestCase):
+    """Test wordlist loading and caching."""
+    
+    def test_missing_file(self):
+        """Test that a missing wordlist loads as an empty set."""
+        self.assertEqual(load_wordlist("does/not/exist.txt"), frozenset())
+    
+    def test_pickle_cache(self):
+        """Test that a parsed wordlist is cached and reloaded from disk."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("Hello\n  world \n\n")
+            
+            words = load_wordlist(path)
+            self.assertEqual(words, frozenset({"hello", "world"}))
+            self.assertTrue(os.path.exists(os.path.join(tmp, "words.txt.pkl")))
+            self.assertEqual(load_wordlist(path), words)
+            self.assertEqual(sorted(os.listdir(tmp)), ["words.txt", "words.txt.pkl"])
+    
+    def test_cache_tracks_source(self):
+        """Test that the cache isn't reused for a replaced or sibling file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("hello\n")
+            self.assertEqual(load_wordlist(path), frozenset({"hello"}))
+            
+            # Replaced by a file with an older timestamp, as cp -p can do
+            stat = os.stat(path)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("world\n")
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+            self.assertEqual(load_wordlist(path), frozenset({"world"}))
+            
+            # A sibling sharing the stem gets its own cache
+            sibling = os.path.join(tmp, "words.lst")
+            with open(sibling, 'w', encoding='utf-8') as f:
+                f.write("other\n")
+            self.assertEqual(load_wordlist(sibling), frozenset({"other"}))
+            self.assertEqual(load_wordlist(path), frozenset({"world"}))
+    
+    def test_corrupt_cache(self):
+        """Test that a corrupt cache is ignored and the text file is parsed."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("hello\n")
+            # Unpickling this raises AttributeError, not UnpicklingError
+            with open(os.path.join(tmp, "words.txt.pkl"), 'wb') as f:
+                f.write(b"cbuiltins\nno_such_name\n.")
+            
+            self.assertEqual(load_wordlist(path), frozenset({"hello"}))
+    
+    def test_length_filter(self):
+        """Test that entries outside the length range are dropped."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("abc\nabcd\nabcdefgh\n")
+            
+            self.assertEqual(load_wordlist(path, min_length=4, max_length=6), frozenset({"abcd"}))
+            self.assertEqual(len(load_wordlist(path)), 3)
+    
+    def test_lowercase_header(self):
+        """Test that the lowercase header line is not loaded as an entry."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("# lowercase\nhello\nworld\n")
+            
+            self.assertEqual(load_wordlist(path), frozenset({"hello", "world"}))
+            self.assertEqual(load_wordlist(path, as_bytes=True), frozenset({b"hello", b"world"}))
+    
+    def test_non_ascii_bytes(self):
+        """Test that bytes entries are lowercased like str.lower() lookups."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("PÄSSWORT\nПАРОЛЬ\nHello\n")
+            
+            words = load_wordlist(path, as_bytes=True)
+            self.assertEqual(words, {word.encode('utf-8') for word in load_wordlist(path)})
+            for password in ("PÄSSWORT", "ПАРОЛЬ", "Hello"):
+                self.assertIn(BreachChecker._blacklist_key(password), words)
+
+
+class TestBloomFilter(unittest.TestCase):
+    """Test Bloom filter membership."""
+    
+    def test_membership(self):
+        """Test that added items are always reported present."""
+        words = [f"word{i}".encode() for i in range(1000)]
+        bloom = BloomFilter.from_items(words, len(words), 0.01)
+        for word in words:
+            self.assertIn(word, bloom)
+        
+        false_positives = sum(f"other{i}".encode() in bloom for i in range(1000))
+        self.assertLess(false_positives, 50)
+    
+    def test_save_and_load(self):
+        """Test that a saved filter loads with the same contents."""
+        words = [f"word{i}".encode() for i in range(100)]
+        bloom = BloomFilter.from_items(words, len(words), 0.01)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blacklist.bloom")
+            bloom.save(path)
+            loaded = BloomFilter.load(path)
+        
+        self.assertEqual(loaded.bits, bloom.bits)
+        self.assertEqual(loaded.num_hashes, bloom.num_hashes)
+        for word in words:
+            self.assertIn(word, loaded)
+
+
+class TestPerfectHash(unittest.TestCase):
+    """Test minimal perfect hash table build and lookup."""
+    
+    def test_build_and_lookup(self):
+        """Test that every key is found and other keys are not."""
+        keys = {f"password{i}".encode() for i in range(500)}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blacklist.mph")
+            build_mph(keys, path)
+            table = PerfectHashTable(path)
+            
+            self.assertEqual(len(table), len(keys))
+            self.assertEqual(set(table), keys)
+            for key in keys:
+                self.assertIn(key, table)
+            self.assertNotIn(b"password500", table)
+            self.assertNotIn(b"", table)
+    
+    def test_colliding_keys(self):
+        """Test that keys inseparable under the default seed still build."""
+        # With seed 0 both keys share their slot hashes modulo 2, so no
+        # displacement can separate them
+        keys = {b"k12_0", b"k12_1"}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blacklist.mph")
+            build_mph(keys, path)
+            table = PerfectHashTable(path)
+            
+            self.assertEqual(set(table), keys)
+            for key in keys:
+                self.assertIn(key, table)
+            self.assertNotIn(b"k12_2", table)
+
+
+class TestSetupData(unittest.TestCase):
+    """Test data file setup."""
+    
+    def test_download_urls(self):
+        """Test that files given a URL are downloaded and the others generated."""
+        from unittest import mock
+        
+        def fake_fetch(url, headers, f, session=None):
+            f.write(f"{url}\n".encode())
+            return True
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            wordlist = os.path.join(tmp, "words.txt")
+            blacklist = os.path.join(tmp, "blacklist.txt")
+            with mock.patch.object(setup_data, "_fetch", fake_fetch), \
+                    mock.patch.object(setup_data, "WORDLIST_FILE", wordlist), \
+                    mock.patch.object(setup_data, "BLACKLIST_FILE", blacklist), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                setup_data.main(["--blacklist-url", "https://example.com/passwords.txt"])
+            
+            with open(blacklist, encoding='utf-8') as f:
+                self.assertEqual(f.read(), "https://example.com/passwords.txt\n")
+            # The downloaded blacklist has no digest sidecar, so it is never
+            # regenerated over
+            self.assertEqual(sorted(os.listdir(tmp)), ["blacklist.txt", "words.sha256", "words.txt"])
+            self.assertIn("about", load_wordlist(wordlist))
 
 
 class TestPasswordScorer(unittest.TestCase):
@@ -148,38 +452,27 @@ class TestPasswordScorer(unittest.TestCase):
 class TestPasswordEvaluator(unittest.TestCase):
     """Integration tests for password evaluator."""
     
-    def setUp(self):
-        self.evaluator = PasswordEvaluator()
+    @classmethod
+    def setUpClass(cls):
+        cls.evaluator = get_evaluator()
     
-    def test_empty_password(self):
-        """Test evaluation of empty password."""
-        result = self.evaluator.evaluate("")
-        self.assertEqual(result["score"], 0)
-        self.assertEqual(result["strength"], "Weak")
-    
-    def test_weak_password(self):
-        """Test evaluation of weak password."""
-        result = self.evaluator.evaluate("password")
-        self.assertLess(result["score"], 40)
-        self.assertEqual(result["strength"], "Weak")
+    # (password, allowed strengths, minimum score, maximum score)
+    STRENGTH_CASES = [
+        ("", ("Weak",), 0, 0),
+        ("password", ("Weak",), 0, 39),
+        ("Password123", ("Weak", "Medium", "Strong"), 0, 100),
+        ("Tr0ub4dor&3", ("Weak", "Medium", "Strong", "Very Strong"), 1, 100),
+        ("Xk9#mP2$vL7@nQ4&wR8!", ("Weak", "Medium", "Strong", "Very Strong"), 60, 100),
+    ]
     
-    def test_medium_password(self):
-        """Test evaluation of medium password."""
-        result = self.evaluator.evaluate("Password123")
-        # Score may vary, but should be classified
-        self.assertIn(result["strength"], ["Weak", "Medium", "Strong"])
-    
-    def test_strong_password(self):
-        """Test evaluation of strong password."""
-        result = self.evaluator.evaluate("Tr0ub4dor&3")
-        # Should have reasonable score
-        self.assertGreater(result["score"], 0)
-    
-    def test_very_strong_password(self):
-        """Test evaluation of very strong password."""
-        result = self.evaluator.evaluate("Xk9#mP2$vL7@nQ4&wR8!")
-        # Long, complex password should score well
-        self.assertGreaterEqual(result["score"], 60)
+    def test_strength_classification(self):
+        """Test scores and strength labels from empty to very strong passwords."""
+        for password, strengths, min_score, max_score in self.STRENGTH_CASES:
+            with self.subTest(password=password):
+                result = self.evaluator.evaluate(password)
+                self.assertIn(result["strength"], strengths)
+                self.assertGreaterEqual(result["score"], min_score)
+                self.assertLessEqual(result["score"], max_score)
     
     def test_username_similarity(self):
         """Test username similarity detection."""
@@ -197,13 +490,61 @@ class TestPasswordEvaluator(unittest.TestCase):
         required_fields = ["score", "strength", "entropy_bits", "issues", "recommendations"]
         for field in required_fields:
             self.assertIn(field, result)
+    
+    def test_evaluate_cached(self):
+        """Test that repeated evaluations are cached but reflect new breaches."""
+        evaluator = PasswordEvaluator()
+        first = evaluator.evaluate("Cached#Pass42")
+        first["issues"].append("modified")
+        second = evaluator.evaluate("Cached#Pass42")
+        self.assertNotIn("modified", second["issues"])
+        self.assertFalse(second["is_breached"])
+        
+        evaluator.breach_checker.add_to_blacklist("Cached#Pass42")
+        self.assertTrue(evaluator.evaluate("Cached#Pass42")["is_breached"])
+    
+    def test_evaluate_batch(self):
+        """Test batch evaluation matches single evaluation, in order."""
+        passwords = ["password", "Tr0ub4dor&3", "password"]
+        results = self.evaluator.evaluate_batch(passwords)
+        self.assertEqual(len(results), 3)
+        for password, result in zip(passwords, results):
+            self.assertEqual(result, self.evaluator.evaluate(password))
+        self.assertIsNot(results[0]["issues"], results[2]["issues"])
+    
+    def test_evaluate_batch_hibp_failure(self):
+        """Test batch and single evaluation agree when HIBP lookups fail."""
+        class FailingSession:
+            def get(self, url, timeout):
+                raise RuntimeError("connection refused")
+        
+        evaluator = PasswordEvaluator()
+        checker = evaluator.breach_checker
+        passwords = ["Unlisted#Pass42", "ab\ud800cd", "password"]
+        original_session = breach._SESSION
+        original_enabled = breach.BREACH_CONFIG["hibp_enabled"]
+        breach._SESSION = FailingSession()
+        breach.BREACH_CONFIG["hibp_enabled"] = True
+        try:
+            self.assertEqual(
+                checker.check_breach_batch(passwords),
+                [checker.check_breach(password) for password in passwords]
+            )
+            self.assertEqual(
+                evaluator.evaluate_batch(passwords),
+                [evaluator.evaluate(password) for password in passwords]
+            )
+        finally:
+            breach._SESSION = original_session
+            breach.BREACH_CONFIG["hibp_enabled"] = original_enabled
 
 
 class TestEdgeCases(unittest.TestCase):
     """Test edge cases and boundary conditions."""
     
-    def setUp(self):
-        self.evaluator = PasswordEvaluator()
+    @classmethod
+    def setUpClass(cls):
+        cls.evaluator = get_evaluator()
     
     def test_very_short_password(self):
         """Test very short password."""
@@ -223,6 +564,18 @@ class TestEdgeCases(unittest.TestCase):
         # Should handle unicode gracefully
         self.assertIsInstance(result["score"], int)
     
+    def test_lone_surrogate_password(self):
+        """Test password with a lone surrogate, as JSON input can contain."""
+        password = "ab\ud800cd"
+        result = self.evaluator.evaluate(password)
+        self.assertIsInstance(result["score"], int)
+        self.assertFalse(result["is_breached"])
+        self.assertEqual(self.evaluator.evaluate_batch([password]), [result])
+        
+        checker = BreachChecker()
+        checker.add_to_blacklist(password.upper())
+        self.assertEqual(checker.check_breach(password), (True, breach.LOCAL_BREACH_REASON))
+    
     def test_special_characters_only(self):
         """Test password with only special characters."""
         result = self.evaluator.evaluate("!@#$%^&*()")
@@ -0,0 +1,150 @@
+"""
+Wordlist loading module for password strength evaluation.
+
+Loads newline-delimited wordlists (dictionary words, breach blacklists) into
+immutable sets. Parsed sets are cached on disk as a pickle next to the source
+file, so the text only has to be parsed again when it changes.
+
+Performance rationale: Parsing a wordlist means a Python-level loop over every
+line. Loading a pre-built set from its pickle skips that loop entirely, which
+keeps process startup fast even for large wordlists. When the text does have
+to be parsed, the file is memory-mapped and lowercased/split as one buffer
+instead of line by line.
+"""
+
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import FrozenSet, Optional, Union
+
+# First line marking a wordlist whose entries are all lowercase already, so
+# the lowercasing pass can be skipped when parsing it
+LOWERCASE_HEADER = "# lowercase"
+
+# Bumped whenever parsing or the cache key changes, so caches built by older
+# code are rebuilt
+_CACHE_FORMAT = 3
+
+
+def _cache_path(wordlist_path: Path) -> Path:
+    """Return the path of the pickle cache for a wordlist (e.g. words.txt.pkl)."""
+    return wordlist_path.with_name(wordlist_path.name + ".pkl")
+
+
+def _read_bytes(wordlist_path: Path) -> bytes:
+    """Read a whole file through a read-only memory map."""
+    with open(wordlist_path, 'rb') as f:
+        # mmap refuses zero-length files
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[:]
+
+
+def _lower_utf8_line(line: bytes) -> bytes:
+    """Strip and lowercase a UTF-8 line as text, the way lookups lowercase."""
+    return line.decode('utf-8', errors='ignore').strip().lower().encode('utf-8')
+
+
+def _parse_wordlist(wordlist_path: Path, as_bytes: bool, min_length: int,
+                    max_length: Optional[int]) -> FrozenSet[Union[str, bytes]]:
+    """
+    Parse a wordlist text file into a set of lowercased entries.
+    
+    The buffer is lowercased once as a whole and then split, rather than
+    stripping and lowercasing each line separately. In bytes mode that is only
+    done for all-ASCII files, since bytes.lower() leaves other letters alone;
+    otherwise non-ASCII lines are lowercased as text, matching str.lower() on
+    the lookup side. Files starting with LOWERCASE_HEADER are taken as
+    already lowercase and not lowercased at all.
+    """
+    data = _read_bytes(wordlist_path)
+    
+    header = LOWERCASE_HEADER.encode('ascii')
+    is_lowercase = data.startswith(header) and data[len(header):len(header) + 1] in (b"\n", b"\r", b"")
+    if is_lowercase:
+        data = data[len(header):]
+    
+    if as_bytes:
+        if is_lowercase:
+            lines = data.splitlines()
+        elif data.isascii():
+            lines = data.lower().splitlines()
+        else:
+            lines = [line.lower() if line.isascii() else _lower_utf8_line(line)
+                     for line in data.splitlines()]
+        strip = bytes.strip
+    else:
+        data = data.decode('utf-8', errors='ignore')
+        if not is_lowercase:
+            data = data.lower()
+        lines = data.splitlines()
+        strip = str.strip
+    entries = filter(None, map(strip, lines))
+    if min_length > 1 or max_length is not None:
+        max_length = max_length if max_length is not None else float('inf')
+        entries = (entry for entry in entries if min_length <= len(entry) <= max_length)
+    return frozenset(entries)
+
+
+def load_wordlist(wordlist_file: str, as_bytes: bool = False, min_length: int = 1,
+                  max_length: Optional[int] = None) -> FrozenSet[Union[str, bytes]]:
+    """
+    Load a wordlist, using the on-disk pickle cache when it is up to date.
+
+    The cache records the source file's name, size and modification time
+    (in nanoseconds) and the load options, and is only used when all of them
+    match exactly, so a replaced file is re-parsed even if its timestamp went
+    backwards (cp -p, archive extraction). Failing to read or write the cache
+    is never fatal: the text file is parsed instead.
+
+    Args:
+        wordlist_file: Path to newline-delimited wordlist file
+        as_bytes: Return UTF-8 encoded ``bytes`` entries instead of ``str``
+        min_length: Drop entries shorter than this
+        max_length: Drop entries longer than this (None for no limit)
+
+    Returns:
+        Frozen set of lowercased entries (empty if the file doesn't exist)
+    """
+    wordlist_path = Path(wordlist_file)
+    if not wordlist_path.exists():
+        return frozenset()
+
+    source_stat = wordlist_path.stat()
+    cache_key = (_CACHE_FORMAT, wordlist_path.name, source_stat.st_size, source_stat.st_mtime_ns,
+                 as_bytes, min_length, max_length)
+    cache_path = _cache_path(wordlist_path)
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        # Cache format: (cache_key, frozenset of entries)
+        if isinstance(cached, tuple) and len(cached) == 2 and cached[0] == cache_key:
+            return cached[1]
+    except Exception:
+        # Missing, unreadable or corrupt cache (a damaged pickle can raise
+        # almost anything) - fall back to parsing the text file
+        pass
+
+    words = _parse_wordlist(wordlist_path, as_bytes, min_length, max_length)
+
+    try:
+        # Write to a uniquely named temporary file first, so readers never see
+        # a partial cache and concurrent writers (e.g. forked server workers)
+        # don't clobber each other's temporary file
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=wordlist_path.name + ".",
+                                        suffix=".pkl.tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((cache_key, words), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError as e:
+        print(f"Warning: Could not write wordlist cache: {e}", file=sys.stderr)
+
+    return words